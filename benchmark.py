@@ -0,0 +1,65 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from main import chromedriver_path
+from pcpartpicker_scraper.blocking import default_blocking
+from pcpartpicker_scraper.replay import ReplayServer, find_fixtures, fixture_path, load_fixture
+from pcpartpicker_scraper.scraper import Scraper, generate_part_urls, merge_listings, merge_pages
+
+
+def expected_rows(directory, region, part):
+    fixture = load_fixture(fixture_path(directory, region, part))
+    listings = {}
+    for listing in fixture["listings"].values():
+        pages = {int(page): [tuple(row) for row in rows] for page, rows in listing["pages"].items()}
+        listings[listing["ecc_type"]] = (fixture["manufacturers"], merge_pages(pages))
+    return set(merge_listings(part, listings)[1])
+
+
+def benchmark(directory, parallel=1, harvest=True, tabs=False, latency=0.0, render_delay=0):
+    combos = find_fixtures(directory)
+    print(f"Replaying {len(combos)} part+region combos from {directory} with {parallel} concurrent scrapes")
+    with ReplayServer(directory, latency=latency, render_delay=render_delay) as server:
+        scraper = Scraper(chromedriver_path, max_drivers=parallel, harvest=harvest, blocking=default_blocking,
+                          tabs=tabs, url_root=server.root)
+
+        def scrape(combo):
+            part, region = combo
+            started = time.perf_counter()
+            _, rows = scraper.get_part_data(region, part)
+            elapsed = time.perf_counter() - started
+            pages = sum(scraper.page_counts[(region, part, ecc_type)] for ecc_type in generate_part_urls(region, part))
+            matches = set(rows) == expected_rows(directory, region, part)
+            print(f"{region}/{part}: {pages} pages in {elapsed:.2f}s, {pages / elapsed:.2f} pages/s"
+                  f"{'' if matches else ', ROWS DIFFER FROM FIXTURE'}")
+            return pages, matches
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(parallel) as executor:
+                results = list(executor.map(scrape, combos))
+        finally:
+            scraper.close()
+        elapsed = time.perf_counter() - started
+    total_pages = sum(pages for pages, _ in results)
+    mismatches = sum(1 for _, matches in results if not matches)
+    print(f"Scraped {total_pages} pages in {elapsed:.2f}s, {total_pages / elapsed:.2f} pages/s, "
+          f"{mismatches} combos differ from their fixtures")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the scraper against recorded pcpartpicker.com listings.')
+    parser.add_argument('fixtures', metavar='DIR', help="Fixture directory written by main.py --record")
+    parser.add_argument('--parallel', '-P', default=1, type=int, metavar='N', help="Run up to N browsers at once")
+    parser.add_argument('--tabs', action='store_true', help="Serve every concurrent scrape from a tab of one browser")
+    parser.add_argument('--latency', default=0.0, type=float, metavar='S',
+                        help="Delay every response of the replay server by S seconds")
+    parser.add_argument('--render-delay', default=0, type=int, metavar='MS',
+                        help="Delay rendering a new page of rows by MS milliseconds after the hash changes")
+    parser.add_argument('--no-harvest', dest='harvest', action='store_false',
+                        help="Navigate to every page separately instead of collecting them in a single session")
+    args = parser.parse_args()
+    if not benchmark(args.fixtures, args.parallel, args.harvest, args.tabs, args.latency, args.render_delay):
+        exit(1)
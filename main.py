@@ -2,18 +2,36 @@ import argparse
 import itertools
 import json
 import os
-from multiprocessing import Pool
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import partial
 from pathlib import Path
 
-from datetime import datetime
-
 from diskcache import Cache
 from tqdm import tqdm
 
-from pcpartpicker_scraper.mappings import part_classes
+from pcpartpicker_scraper.archive import PageArchive, extract_archived, is_complete
+from pcpartpicker_scraper.autoscale import Autoscaler
+from pcpartpicker_scraper.blocking import default_blocking
+from pcpartpicker_scraper.checkpoint import PageCheckpoint
+from pcpartpicker_scraper.engine import ScrapeEngine
+from pcpartpicker_scraper.fingerprint import ListingFingerprints
+from pcpartpicker_scraper.history import ScrapeHistory
+from pcpartpicker_scraper.manifest import PublishManifest, raw_digest, write_atomic
+from pcpartpicker_scraper.manufacturers import ManufacturerCache
+from pcpartpicker_scraper.mappings import currency_symbols, part_classes
 from pcpartpicker_scraper.parser import Parser
-from pcpartpicker_scraper.scraper import Scraper
+from pcpartpicker_scraper.planner import chunk_by_size, has_exclusives, join_prices, split_by_region
+from pcpartpicker_scraper.prices import refresh_prices
+from pcpartpicker_scraper.raw_store import RawStore
+from pcpartpicker_scraper.replay import FixtureRecorder
+from pcpartpicker_scraper.scraper import Scraper, generate_part_urls, merge_listings, merge_pages
 from pcpartpicker_scraper.serialization import dataclass_to_dict, dataclass_from_dict
+from pcpartpicker_scraper.stages import publish_digest, scrape_digest
+from pcpartpicker_scraper.telemetry import Telemetry
+from pcpartpicker_scraper.work_queue import WorkQueue, default_owner, run_worker
 
 html_doc = """<!DOCTYPE html>
 <html lang="en">
@@ -27,116 +45,443 @@ html_doc = """<!DOCTYPE html>
 </html>"""
 
 
-def scrape_part_region_combo(p):
-    part = p[0]
-    region = p[1]
-    scraper = Scraper("/usr/lib/chromium-browser/chromedriver")
-    cache = Cache("/tmp/pcpartpicker-cache/")
+chromedriver_path = "/usr/lib/chromium-browser/chromedriver"
+
+
+supported_parts = {"cpu", "cpu-cooler", "motherboard", "memory", "internal-hard-drive",
+                   "video-card", "power-supply", "case", "case-fan", "fan-controller",
+                   "thermal-paste", "optical-drive", "sound-card", "wired-network-card",
+                   "wireless-network-card", "monitor", "external-hard-drive", "headphones",
+                   "keyboard", "mouse", "speakers", "ups"}
+
+supported_regions = {"au", "be", "ca", "de", "es", "fr", "se",
+                     "in", "ie", "it", "nz", "uk", "us"}
 
-    part_data = scraper.get_part_data(region, part)
-    stored_parts = cache[region]
-    stored_parts.update({part: part_data})
-    cache[region] = stored_parts
+default_max_age = timedelta(days=30)
+
+
+def store_part_region_combo(part, region, part_data):
+    RawStore().put(region, part, part_data, code=scrape_digest(part))
+    PageCheckpoint().discard(region, part)
     print(f"finished with {region}/{part}")
 
 
-def scrape_part_data(pool_size):
-    supported_parts = {"cpu", "cpu-cooler", "motherboard", "memory", "internal-hard-drive",
-                       "video-card", "power-supply", "case", "case-fan", "fan-controller",
-                       "thermal-paste", "optical-drive", "sound-card", "wired-network-card",
-                       "wireless-network-card", "monitor", "external-hard-drive", "headphones",
-                       "keyboard", "mouse", "speakers", "ups"}
+def stale_scrape_combos(max_age=default_max_age):
+    # A combo is scraped again once it is older than max_age or was scraped by code that has changed since
+    store = RawStore()
+    combos = itertools.product(supported_parts, supported_regions)
+    return [(part, region) for part, region in combos
+            if not store.is_fresh(region, part, scrape_digest(part), max_age)]
 
-    supported_regions = {"au", "be", "ca", "de", "es", "fr", "se",
-                         "in", "ie", "it", "nz", "uk", "us"}
 
+def find_combos_to_scrape(max_age=default_max_age):
+    store = RawStore()
+    store.migrate()
+    to_scrape = stale_scrape_combos(max_age)
+    total_to_scrape = len(supported_parts) * len(supported_regions)
+    checkpoint = PageCheckpoint()
+    for part, region in to_scrape:
+        # Pages left over from the scrape of a stored combo must not be resumed into the new one
+        if (region, part) in store:
+            checkpoint.discard(region, part)
+    return to_scrape, total_to_scrape
 
-    cache = Cache("/tmp/pcpartpicker-cache/")
-    if "timestamp" in cache:
-        timestamp = cache["timestamp"]
-        if datetime.now().month > timestamp.month:
-            cache.clear()
-            cache["timestamp"] = datetime.now()
-            print("Clearing cache...")
-    else:
-        cache.clear()
-        cache["timestamp"] = datetime.now()
-        print("Clearing cache...")
 
-    for region in supported_regions:
-        if region not in cache:
-            cache[region] = {}
+def create_scraper(args, telemetry=None):
+    # Price rows must never end up in the checkpoint of a full scrape
+    checkpoint = None if args.prices_only else PageCheckpoint(expire=args.max_age.total_seconds())
+    fingerprints = None if args.prices_only or not args.reuse_unchanged else ListingFingerprints()
+    manufacturer_cache = ManufacturerCache(ttl=args.manufacturers_ttl * 24 * 60 * 60)
+    recorder = FixtureRecorder(args.record) if args.record is not None and not args.prices_only else None
+    archive = PageArchive() if args.archive and not args.prices_only else None
+    return Scraper(chromedriver_path, max_drivers=args.parallel, max_pages=args.recycle_after, harvest=args.harvest,
+                   blocking=args.blocking, checkpoint=checkpoint, page_attempts=args.retries + 1,
+                   tabs=args.tabs, telemetry=telemetry, prices_only=args.prices_only, fingerprints=fingerprints,
+                   confirm_pages=args.confirm_pages, manufacturer_cache=manufacturer_cache,
+                   recorder=recorder, archive=archive)
 
-    to_scrape = list(itertools.product(supported_parts, supported_regions))
-    total_to_scrape = len(to_scrape)
-    to_scrape = list(filter(lambda x: x[0] not in cache[x[1]], to_scrape))
-    pool = Pool(pool_size)
-    print(f"About to scrape {len(to_scrape)}/{total_to_scrape} part+region combos that are not cached using {pool_size} concurrent requests")
-    pool.map(scrape_part_region_combo, to_scrape)
 
+def report_failures(failures, total):
+    if failures:
+        print(f"Failed to scrape {len(failures)}/{total} part+region combos:")
+        for part, region, error in sorted(failures, key=lambda x: (x[1], x[0])):
+            print(f"  {region}/{part}: {error}")
 
-def parse_part_data():
-    cache = Cache("/tmp/pcpartpicker-cache/")
 
-    parsed_part_data = {}
-    for region in tqdm(cache):
-        if region == "timestamp":
-            continue
-        parsed_parts = {}
-        part_data = cache[region]
-        for part, part_data in part_data.items():
-            manufacturers, parts = part_data
-            parser = Parser(region, part, manufacturers)
-            pparts = parser.parse(parts)
-            parsed_parts[part] = pparts
-        parsed_part_data[region] = parsed_parts
-    parsed_cache = Cache(os.path.expanduser("~/pcpartpicker-parsed/"))
-    parsed_cache["current"] = parsed_part_data
-
-
-def create_json():
-    all_data = {}
-    cache = Cache(os.path.expanduser("~/pcpartpicker-parsed/"))
-    region_data = cache["current"]
-    for region in tqdm(region_data):
-        part_data = region_data[region]
-        dict_data = {}
-        for part, data in part_data.items():
-            data_to_dict = [dataclass_to_dict(item) for item in data]
-            dict_data.update({part: data_to_dict})
-        all_data.update({region: dict_data})
-    cache = Cache(os.path.expanduser("~/pcpartpicker-json/"))
-    cache["current"] = all_data
-
-
-def update_html():
-    cache = Cache(os.path.expanduser("~/pcpartpicker-json/"))
-    all_data = cache["current"]
+def scrape_part_data(scraper, concurrency=None, rate=1.0, burst=5, retries=2, autoscaler=None,
+                     max_age=default_max_age):
+    to_scrape, total_to_scrape = find_combos_to_scrape(max_age)
+    pool_size = scraper.pool.max_drivers
+    concurrency = concurrency or pool_size
+    sessions = f"{pool_size} tabs of one browser" if scraper.tabs else f"{pool_size} browsers"
+    print(f"About to scrape {len(to_scrape)}/{total_to_scrape} part+region combos that are stale using {sessions} and {concurrency} concurrent requests")
+    engine = ScrapeEngine(scraper, concurrency=concurrency, rate=rate, burst=burst, attempts=retries + 1,
+                          history=ScrapeHistory(), autoscaler=autoscaler)
+    failures = engine.run(to_scrape, store_part_region_combo)
+    report_failures([(part, region, f"{type(e).__name__}: {e}") for part, region, e in failures], len(to_scrape))
+
+
+def scrape_planned_part_data(scraper, primary, concurrency=None, rate=1.0, burst=5, retries=2, autoscaler=None,
+                             max_age=default_max_age):
+    # Specs are scraped in full from the primary region only, every other region only needs its prices
+    to_scrape, total_to_scrape = find_combos_to_scrape(max_age)
+    spec_combos, price_combos = split_by_region(to_scrape, primary)
+    concurrency = concurrency or scraper.pool.max_drivers
+    history = ScrapeHistory()
+    print(f"About to scrape {len(to_scrape)}/{total_to_scrape} part+region combos that are stale, "
+          f"{len(spec_combos)} in full from {primary} and {len(price_combos)} from other regions by price "
+          f"where possible")
+
+    def run(combos, on_result, prices_only=False):
+        engine = ScrapeEngine(scraper, concurrency=concurrency, rate=rate, burst=burst, attempts=retries + 1,
+                              history=history, autoscaler=autoscaler, prices_only=prices_only)
+        return [(part, region, f"{type(e).__name__}: {e}") for part, region, e in engine.run(combos, on_result)]
+
+    failures = run(spec_combos, store_part_region_combo)
+    store = RawStore()
+    # Combos that listed products the primary region lacks last time are scraped in full without a price pass
+    full_combos = [(part, region) for part, region in price_combos
+                   if (primary, part) not in store or history.needs_full_scrape(part, region)]
+    price_combos = [combo for combo in price_combos if combo not in full_combos]
+
+    def join_part_prices(part, region, part_data):
+        manufacturers, spec_rows = store.get(primary, part)
+        rows, unmatched = join_prices(part, spec_rows, part_data[1], currency_symbols[region])
+        if unmatched:
+            print(f"{len(unmatched)} products of {region}/{part} are not listed in {primary}, scraping it in full")
+            history.record_full_scrape(part, region, True)
+            full_combos.append((part, region))
+        else:
+            store_part_region_combo(part, region, (manufacturers, rows))
+
+    def store_full_scrape(part, region, part_data):
+        # Once a region no longer lists anything the primary region lacks, it goes back to price passes
+        if (primary, part) in store:
+            history.record_full_scrape(part, region, has_exclusives(part, store.get(primary, part)[1], part_data[1]))
+        store_part_region_combo(part, region, part_data)
+
+    failures += run(price_combos, join_part_prices, prices_only=True)
+    if full_combos:
+        failures += run(full_combos, store_full_scrape)
+    report_failures(failures, len(to_scrape))
+
+
+def coordinate_scrape(queue_path, poll_interval=10, max_age=default_max_age):
+    # The coordinator only hands out work and stores results, workers on any machine do the scraping
+    to_scrape, total_to_scrape = find_combos_to_scrape(max_age)
+    queue = WorkQueue(queue_path)
+    history = ScrapeHistory()
+    jobs = [(part, region, ecc_type) for part, region in to_scrape for ecc_type in generate_part_urls(region, part)]
+    # The average page rate scans the whole history, so it is worked out once rather than for every job
+    seconds_per_page = history.seconds_per_page()
+    queue.enqueue(jobs, priorities=lambda job: history.estimate(job, seconds_per_page) or 0)
+    print(f"Queued {len(jobs)} listings for {len(to_scrape)}/{total_to_scrape} part+region combos in {queue_path}")
+    while True:
+        finished = queue.is_finished()
+        collect_finished_combos(queue)
+        if finished:
+            break
+        time.sleep(poll_interval)
+    failed = {(part, region): error for (part, region, _), error in queue.results("failed")}
+    report_failures([(part, region, error) for (part, region), error in failed.items()], len(to_scrape))
+
+
+def collect_finished_combos(queue):
+    listings = {}
+    for (part, region, ecc_type), listing in queue.results():
+        listings.setdefault((part, region), {})[ecc_type] = listing
+    for (part, region), combo_listings in listings.items():
+        if len(combo_listings) == len(generate_part_urls(region, part)):
+            store_part_region_combo(part, region, merge_listings(part, combo_listings))
+            queue.collect(part, region)
+
+
+def work_from_queue(scraper, queue_path, workers=1, retries=2, rate=1.0, burst=5):
+    # The queue retries failed listings itself, the engine only paces every host and stops on a failing one
+    queue = WorkQueue(queue_path, max_attempts=retries + 1)
+    engine = ScrapeEngine(scraper, concurrency=workers, rate=rate, burst=burst, attempts=1)
+
+    def discard_checkpoint(job):
+        # Only the coordinator stores results, so a worker drops its pages once the queue holds the listing
+        if scraper.checkpoint is not None:
+            part, region, ecc_type = job
+            scraper.checkpoint.discard_listing((region, part, ecc_type))
+
+    with engine.throttling():
+        threads = [threading.Thread(target=run_worker, args=(queue, engine.scrape, f"{default_owner()}-{i}"),
+                                    kwargs={"on_complete": discard_checkpoint})
+                   for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def docs_path():
     dir_path = os.path.dirname(os.path.realpath(__file__))
-    path = Path(os.path.join(dir_path, "docs"))
-    if not path.exists():
-        path.mkdir()
-    for region in all_data:
-        region_path = path / region
-        if not region_path.exists():
-            region_path.mkdir()
-        for part in all_data[region]:
-            part_data = all_data[region][part]
-            # Check that all dicts are valid
-            dataclass_data = [dataclass_from_dict(part_classes[part], item) for item in part_data]
-            part_string = json.dumps(part_data)
-            html = html_doc.format(part_string)
-            file_name = part + ".html"
-            with open(region_path / file_name, "w+") as file:
-                file.write(html)
+    return Path(os.path.join(dir_path, "docs"))
+
+
+def snapshot_path(region, part):
+    return docs_path() / region / (part + ".html")
+
+
+def write_snapshot(region, part, part_data):
+    return write_atomic(str(snapshot_path(region, part)), html_doc.format(json.dumps(part_data)))
+
+
+def refresh_part_prices(part, region, part_data):
+    # The prices are applied to the stored rows when the combo is published, so publishing never undoes them
+    RawStore().put_prices(region, part, part_data[1])
+    print(f"refreshed prices of {region}/{part}")
+
+
+def apply_prices(region, part, dict_data, price_rows):
+    parser = Parser(region, part, [])
+
+    def parse_price(price):
+        money = parser.price(price)
+        return [str(money.amount), money.currency.code] if money is not None else None
+
+    dict_data, stats = refresh_prices(part, dict_data, price_rows, parse_price)
+    print(f"refreshed prices of {region}/{part}: {stats['updated']} updated, {stats['unavailable']} unavailable, "
+          f"{stats['ambiguous']} ambiguous, {stats['new']} new products waiting for a full scrape")
+    return dict_data
+
+
+def scrape_prices(scraper, concurrency=None, rate=1.0, burst=5, retries=2, autoscaler=None):
+    # Only refreshes the prices of the part+region combos that have been scraped in full before
+    store = RawStore()
+    store.migrate()
+    to_scrape = [(part, region) for region, part in store.combos()
+                 if part in supported_parts and region in supported_regions]
+    concurrency = concurrency or scraper.pool.max_drivers
+    print(f"About to refresh the prices of {len(to_scrape)} part+region combos with {concurrency} concurrent requests")
+    engine = ScrapeEngine(scraper, concurrency=concurrency, rate=rate, burst=burst, attempts=retries + 1,
+                          history=ScrapeHistory(), autoscaler=autoscaler)
+    failures = engine.run(to_scrape, refresh_part_prices)
+    report_failures([(part, region, f"{type(e).__name__}: {e}") for part, region, e in failures], len(to_scrape))
+
+
+def reextract_part_data(run=None, jobs=None):
+    # Rebuilds the scrape cache from archived html instead of a browser, e.g. after a fix to parser.find_products
+    archive = PageArchive()
+    manifest = archive.manifest(run) if run is not None else archive.latest()
+    complete = {key: listing for key, listing in manifest.items() if is_complete(listing)}
+    for region, part, ecc_type in sorted(manifest.keys() - complete.keys(), key=lambda x: (x[0], x[1], x[2] or "")):
+        print(f"Cannot re-extract {region}/{part} {ecc_type or ''}, the archive is missing some of its pages")
+    digests = sorted({digest for listing in complete.values() for digest in listing["digests"].values()})
+    print(f"Re-extracting {len(digests)} archived pages of {len(complete)} listings "
+          f"with {jobs or os.cpu_count()} processes")
+    with ProcessPoolExecutor(jobs) as executor:
+        rows = dict(zip(digests, executor.map(partial(extract_archived, archive.directory), digests, chunksize=16)))
+
+    combos = {}
+    for (region, part, ecc_type), listing in complete.items():
+        pages = {page: rows[digest] for page, digest in listing["digests"].items()}
+        combos.setdefault((part, region), {})[ecc_type] = (listing["manufacturers"], merge_pages(pages))
+    for (part, region), listings in combos.items():
+        if len(listings) == len(generate_part_urls(region, part)):
+            store_part_region_combo(part, region, merge_listings(part, listings))
+
+
+def parse_part(region, part, part_data):
+    manufacturers, parts = part_data
+    parser = Parser(region, part, manufacturers)
+    return parser.parse(parts)
+
+
+def serialize_part(parsed_parts):
+    return [dataclass_to_dict(item) for item in parsed_parts]
+
+
+def write_part_html(region, part, dict_data):
+    region_path = docs_path() / region
+    if not region_path.exists():
+        region_path.mkdir(parents=True)
+    # Check that all dicts are valid
+    for item in dict_data:
+        dataclass_from_dict(part_classes[part], item)
+    return write_snapshot(region, part, dict_data)
+
+
+def publish_input_digest(region, part, part_data, price_rows=None):
+    # The published file depends on the raw rows, any refreshed prices and the code and template that turn them into it
+    digest = raw_digest(part_data) + ":" + publish_digest(region, part, [html_doc])
+    if price_rows is not None:
+        digest += ":" + raw_digest(([], price_rows))
+    return digest
+
+
+def stale_publish_combos():
+    store = RawStore()
+    manifest = PublishManifest()
+    return [(region, part) for region, part, part_data in store.items()
+            if not manifest.is_current(region, part,
+                                       publish_input_digest(region, part, part_data, store.get_prices(region, part)),
+                                       str(snapshot_path(region, part)))]
+
+
+def publish_combos(combos, spill=False, force=False):
+    # Every part+region combo goes from raw rows to its html file before the next one is loaded, so memory use
+    # does not grow with the catalog. With spill, the parsed and serialized stages are also kept on disk.
+    store = RawStore()
+    manifest = PublishManifest()
+    parsed_cache = Cache(os.path.expanduser("~/pcpartpicker-parsed/")) if spill else None
+    json_cache = Cache(os.path.expanduser("~/pcpartpicker-json/")) if spill else None
+    published = []
+    for region, part in combos:
+        part_data = store.get(region, part)
+        price_rows = store.get_prices(region, part)
+        input_digest = publish_input_digest(region, part, part_data, price_rows)
+        # A combo whose inputs and published file are all unchanged is skipped before it is parsed
+        if not force and manifest.is_current(region, part, input_digest, str(snapshot_path(region, part))):
+            published.append(False)
+            continue
+        parsed_parts = parse_part(region, part, part_data)
+        if parsed_cache is not None:
+            parsed_cache[(region, part)] = parsed_parts
+        dict_data = serialize_part(parsed_parts)
+        if price_rows is not None:
+            dict_data = apply_prices(region, part, dict_data, price_rows)
+        if json_cache is not None:
+            json_cache[(region, part)] = dict_data
+        manifest.record(region, part, input_digest, write_part_html(region, part, dict_data))
+        published.append(True)
+    return published
+
+
+def print_status(max_age=default_max_age):
+    # Lists the work a run would do without doing any of it, or writing anything
+    if RawStore().needs_migration():
+        print("The scrape cache was written by an older version, its combos count as stale until the next run "
+              "migrates it")
+    to_scrape = stale_scrape_combos(max_age)
+    to_publish = stale_publish_combos()
+    print(f"{len(to_scrape)} part+region combos to scrape:")
+    for part, region in sorted(to_scrape, key=lambda x: (x[1], x[0])):
+        print(f"  {region}/{part}")
+    print(f"{len(to_publish)} part+region combos to publish:")
+    for region, part in to_publish:
+        print(f"  {region}/{part}")
+
+
+def publish_part_data(spill=False, jobs=None, force=False):
+    store = RawStore()
+    store.migrate()
+    combos = store.combos()
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        published = publish_combos(tqdm(combos), spill, force)
+        print(f"Published {sum(published)}/{len(combos)} part+region combos that changed")
+        return
+    # The page counts of the last scrape stand in for the size of every combo
+    history = ScrapeHistory()
+    sizes = {(region, part): sum(history.pages((part, region, ecc_type)) or 1
+                                 for ecc_type in generate_part_urls(region, part))
+             for region, part in combos}
+    chunks = chunk_by_size(combos, sizes, sum(sizes.values()) / (jobs * 4))
+    published = []
+    with ProcessPoolExecutor(jobs) as executor:
+        futures = [executor.submit(publish_combos, chunk, spill, force) for chunk in chunks]
+        with tqdm(total=len(combos)) as progress:
+            for future in futures:
+                published += future.result()
+                progress.update(len(future.result()))
+    print(f"Published {sum(published)}/{len(combos)} part+region combos that changed")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Scrape pcpartpicker.com.')
-    parser.add_argument('--parallel', '-P', default=2, type=int, metavar='N', help="Scrape up to N pages concurrently")
+    parser.add_argument('command', nargs='?', default='all', choices=['all', 'scrape', 'publish', 'status'],
+                        help="Run every stage, only scrape, only publish, or list the stale combos of each stage")
+    parser.add_argument('--parallel', '-P', default=2, type=int, metavar='N', help="Run up to N browsers at once")
+    parser.add_argument('--tabs', action='store_true',
+                        help="Serve every concurrent scrape from its own tab of a single browser, --parallel sets the tab count")
+    parser.add_argument('--concurrency', '-C', default=None, type=int, metavar='N',
+                        help="Keep up to N part+region combos in flight (defaults to --parallel)")
+    parser.add_argument('--autoscale', action='store_true',
+                        help="Grow and shrink the number of browsers with free memory, CPU load, latency and errors")
+    parser.add_argument('--min-parallel', default=1, type=int, metavar='N', help="Never autoscale below N browsers")
+    parser.add_argument('--max-parallel', default=8, type=int, metavar='N', help="Never autoscale above N browsers")
+    parser.add_argument('--memory-per-session', default=500, type=int, metavar='MB',
+                        help="Memory to keep free for every additional browser or tab when autoscaling")
+    parser.add_argument('--rate', default=1.0, type=float, metavar='R',
+                        help="Request at most R pages per second from each pcpartpicker host")
+    parser.add_argument('--burst', default=5, type=float, metavar='N',
+                        help="Allow bursts of up to N pages per host above --rate")
+    parser.add_argument('--retries', default=2, type=int, metavar='N',
+                        help="Retry a failed page or part+region combo up to N times")
+    parser.add_argument('--recycle-after', default=200, type=int, metavar='N',
+                        help="Restart a browser after it has loaded N pages")
+    parser.add_argument('--no-reuse', dest='reuse_unchanged', action='store_false',
+                        help="Crawl every page even of listings that have not changed since their last scrape")
+    parser.add_argument('--confirm-pages', default=2, type=int, metavar='N',
+                        help="Reuse the stored pages of a listing once its first page and N more are unchanged")
+    parser.add_argument('--max-age', default=default_max_age, type=lambda days: timedelta(days=float(days)),
+                        metavar='DAYS', help="Scrape a part+region combo again once it is older than DAYS")
+    parser.add_argument('--manufacturers-ttl', default=30, type=float, metavar='DAYS',
+                        help="Reuse the manufacturer list of a part and region for DAYS before reading it again")
+    parser.add_argument('--primary-region', default=None, choices=sorted(supported_regions), metavar='REGION',
+                        help="Scrape full specs from REGION only, and only prices from the other regions")
+    parser.add_argument('--prices-only', action='store_true',
+                        help="Only refresh the prices of the products already published in docs/, keeping their specs")
+    parser.add_argument('--queue', default=None, metavar='PATH',
+                        help="Share the scrape between machines through the SQLite work queue at PATH")
+    parser.add_argument('--role', default='coordinator', choices=['coordinator', 'worker'],
+                        help="With --queue, either queue the work and publish the results, or scrape queued listings")
+    parser.add_argument('--no-archive', dest='archive', action='store_false',
+                        help="Do not keep the html of every scraped product table for --reextract")
+    parser.add_argument('--reextract', nargs='?', const='', default=None, metavar='RUN',
+                        help="Rebuild the part data from the html archived by a run, by default the newest "
+                             "complete scrape of every listing across all runs, instead of scraping")
+    parser.add_argument('--jobs', '-j', default=None, type=int, metavar='N',
+                        help="Use N processes for --reextract and for parsing and publishing (defaults to the "
+                             "number of CPUs)")
+    parser.add_argument('--record', default=None, metavar='DIR',
+                        help="Record every scraped listing as a replay fixture in DIR for benchmark.py")
+    parser.add_argument('--republish', action='store_true',
+                        help="Parse and publish every part+region combo, even the ones that have not changed")
+    parser.add_argument('--spill', action='store_true',
+                        help="Also keep the parsed and serialized data of every part+region combo on disk")
+    parser.add_argument('--metrics', default=None, metavar='PATH',
+                        help="Append per-page scrape timings, sizes and retries to PATH as JSON lines")
+    parser.add_argument('--metrics-snapshot', default=None, metavar='PATH',
+                        help="Write a Prometheus text-format snapshot of the scrape metrics to PATH")
+    parser.add_argument('--no-harvest', dest='harvest', action='store_false',
+                        help="Navigate to every page separately instead of collecting them in a single session")
+    parser.add_argument('--no-blocking', dest='blocking', action='store_const', const=None, default=default_blocking,
+                        help="Let the browser download images, fonts, stylesheets and third-party resources")
 
     args = parser.parse_args()
-    scrape_part_data(args.parallel)
-    parse_part_data()
-    create_json()
-    update_html()
+    autoscaler = None
+    if args.autoscale:
+        autoscaler = Autoscaler(args.min_parallel, args.max_parallel, args.memory_per_session * 1024 * 1024)
+        args.parallel = max(args.min_parallel, min(args.max_parallel, args.parallel))
+    if args.command == "status":
+        print_status(args.max_age)
+    elif args.reextract is not None:
+        reextract_part_data(args.reextract or None, args.jobs)
+    elif args.command in ("all", "scrape"):
+        telemetry = Telemetry(args.metrics)
+        scraper = create_scraper(args, telemetry)
+        try:
+            if args.prices_only:
+                scrape_prices(scraper, args.concurrency, args.rate, args.burst, args.retries, autoscaler)
+            elif args.primary_region is not None:
+                scrape_planned_part_data(scraper, args.primary_region, args.concurrency, args.rate, args.burst,
+                                         args.retries, autoscaler, args.max_age)
+            elif args.queue is None:
+                scrape_part_data(scraper, args.concurrency, args.rate, args.burst, args.retries, autoscaler,
+                                 args.max_age)
+            elif args.role == "worker":
+                work_from_queue(scraper, args.queue, args.parallel, args.retries, args.rate, args.burst)
+            else:
+                coordinate_scrape(args.queue, max_age=args.max_age)
+        finally:
+            scraper.close()
+            telemetry.close()
+            if args.metrics_snapshot is not None:
+                telemetry.write_prometheus(args.metrics_snapshot)
+    if args.command in ("all", "publish") and args.role == "coordinator":
+        publish_part_data(args.spill, args.jobs, args.republish)
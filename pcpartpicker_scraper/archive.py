@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import lz4.frame
+
+from .checkpoint import PageKey
+from .parser import find_products
+
+
+class PageArchive:
+    """PageArchive:
+
+    This class stores the product table of every fetched page as lz4 compressed html, addressed by the SHA-256 of the
+    html so that a page that has not changed is only stored once. Every run writes a JSON lines manifest that maps
+    each (region, part, ECC filter, page) to the html it was read from, which lets rows be extracted again with new
+    parsing code without opening a browser.
+    """
+
+    def __init__(self, directory: str = os.path.expanduser("~/pcpartpicker-archive/"),
+                 run: Optional[str] = None) -> None:
+        self.directory = directory
+        self.run = run if run is not None else datetime.now().strftime("%Y%m%dT%H%M%S")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "runs"), exist_ok=True)
+
+    def put(self, html: str) -> str:
+        """
+        Stores a fragment of html unless it is already stored, and returns its digest.
+        """
+
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(lz4.frame.compress(data))
+            os.replace(temporary, path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        with open(self._object_path(digest), "rb") as file:
+            return lz4.frame.decompress(file.read()).decode("utf-8")
+
+    def record_listing(self, key: PageKey, manufacturers: List[str], page_count: int) -> None:
+        self._append({"region": key[0], "part": key[1], "ecc_type": key[2], "manufacturers": manufacturers,
+                      "pages": page_count})
+
+    def record_page(self, key: PageKey, page: int, digest: str) -> None:
+        self._append({"region": key[0], "part": key[1], "ecc_type": key[2], "page": page, "digest": digest})
+
+    def runs(self) -> List[str]:
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(os.path.join(self.directory, "runs"))
+                      if name.endswith(".jsonl"))
+
+    def manifest(self, run: Optional[str] = None) -> Dict[PageKey, dict]:
+        """
+        Reads the manifest of a run, by default the latest one.
+
+        :param run: Optional[str]: The run to read.
+        :return: Dict[PageKey, dict]: The manufacturers, page count and page digests of every listing of the run.
+        """
+
+        if run is None:
+            runs = self.runs()
+            if not runs:
+                return {}
+            run = runs[-1]
+        listings = {}
+        with open(self._manifest_path(run)) as file:
+            for line in file:
+                entry = json.loads(line)
+                key = (entry["region"], entry["part"], entry["ecc_type"])
+                listing = listings.setdefault(key, {"manufacturers": [], "pages": 0, "digests": {}})
+                if "digest" in entry:
+                    listing["digests"][entry["page"]] = entry["digest"]
+                else:
+                    listing["manufacturers"] = entry["manufacturers"]
+                    listing["pages"] = entry["pages"]
+        return listings
+
+    def latest(self) -> Dict[PageKey, dict]:
+        """
+        Combines the manifests of every run into the newest complete scrape of each listing. A run only scrapes the
+        listings that were stale, so the latest run alone covers a small part of the catalog.
+        """
+
+        listings = {}
+        for run in self.runs():
+            for key, listing in self.manifest(run).items():
+                if is_complete(listing) or not is_complete(listings.get(key)):
+                    listings[key] = listing
+        return listings
+
+    def _append(self, entry: dict) -> None:
+        with self._lock:
+            with open(self._manifest_path(self.run), "a") as file:
+                file.write(json.dumps(entry) + "\n")
+
+    def _manifest_path(self, run: str) -> str:
+        return os.path.join(self.directory, "runs", run + ".jsonl")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest[2:] + ".lz4")
+
+
+def is_complete(listing: Optional[dict]) -> bool:
+    # A listing can only be extracted again if the archive holds every one of its pages
+    return listing is not None and listing["pages"] > 0 and len(listing["digests"]) >= listing["pages"]
+
+
+def extract_archived(directory: str, digest: str) -> List[tuple]:
+    """
+    Function that extracts the product rows from an archived page with parser.find_products. It opens its own
+    archive so that it can run in a worker process.
+    """
+
+    return find_products(PageArchive(directory, run="").get(digest))
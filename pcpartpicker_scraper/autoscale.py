@@ -0,0 +1,99 @@
+import os
+import threading
+from collections import deque
+from typing import Optional
+
+
+def available_memory() -> Optional[int]:
+    """
+    Function that returns the number of bytes of memory that can be used without swapping, if the system reports it.
+    """
+
+    try:
+        with open("/proc/meminfo") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def cpu_load() -> Optional[float]:
+    """
+    Function that returns the one minute load average per CPU, if the system reports it.
+    """
+
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (OSError, AttributeError):
+        return None
+
+
+class Autoscaler:
+    """Autoscaler:
+
+    This class decides how many browser sessions a scrape should keep active. It shrinks the session count while
+    memory is short, the CPUs are saturated, pages are slow or requests keep failing, and grows it one step at a
+    time while there is headroom on every one of those signals. The count always stays within [minimum, maximum].
+    """
+
+    def __init__(self, minimum: int = 1, maximum: int = 8, memory_per_session: int = 500 * 1024 * 1024,
+                 max_load: float = 0.85, max_latency: float = 20.0, max_error_rate: float = 0.2,
+                 window: int = 20) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.memory_per_session = memory_per_session
+        self.max_load = max_load
+        self.max_latency = max_latency
+        self.max_error_rate = max_error_rate
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: Optional[float] = None, error: bool = False) -> None:
+        """
+        Records the outcome of a request.
+
+        :param latency: Optional[float]: Seconds per page of a successful request.
+        :param error: bool: Whether the request failed.
+        """
+
+        with self._lock:
+            self.samples.append((latency, error))
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.samples:
+                return 0.0
+            return sum(1 for _, error in self.samples if error) / len(self.samples)
+
+    def latency(self) -> Optional[float]:
+        with self._lock:
+            latencies = [latency for latency, error in self.samples if not error and latency is not None]
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+    def target(self, current: int) -> int:
+        """
+        Returns the number of sessions that should be active, given how many are active now.
+        """
+
+        memory = available_memory()
+        load = cpu_load()
+        latency = self.latency()
+        error_rate = self.error_rate()
+
+        if ((memory is not None and memory < self.memory_per_session) or
+                (load is not None and load > self.max_load) or
+                (latency is not None and latency > self.max_latency) or
+                error_rate > self.max_error_rate):
+            target = current - 1
+        elif ((memory is None or memory > 2 * self.memory_per_session) and
+              (load is None or load < 0.75 * self.max_load) and
+              (latency is None or latency < 0.75 * self.max_latency) and
+              error_rate <= self.max_error_rate / 2):
+            target = current + 1
+        else:
+            target = current
+        return max(self.minimum, min(self.maximum, target))
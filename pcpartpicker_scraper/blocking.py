@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from selenium import webdriver
+
+font_patterns: Tuple[str, ...] = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot")
+
+image_patterns: Tuple[str, ...] = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico")
+
+stylesheet_patterns: Tuple[str, ...] = ("*.css",)
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """Dataclass that describes which resources the headless browser is allowed to download.
+
+    Only the first-party html and scripts that render the product table are needed, so by default
+    images, fonts and stylesheets are dropped and every host outside of pcpartpicker.com fails to resolve.
+    """
+    images: bool = True
+    fonts: bool = True
+    stylesheets: bool = True
+    allowed_hosts: Optional[Tuple[str, ...]] = ("pcpartpicker.com", "*.pcpartpicker.com", "localhost")
+    """Optional[Tuple[str, ...]]: Hosts that may be contacted, or None to allow every host."""
+    blocked_url_patterns: Tuple[str, ...] = ()
+    """Tuple[str, ...]: Additional URL wildcard patterns to block."""
+
+    def url_patterns(self) -> Tuple[str, ...]:
+        patterns = self.blocked_url_patterns
+        if self.images:
+            patterns += image_patterns
+        if self.fonts:
+            patterns += font_patterns
+        if self.stylesheets:
+            patterns += stylesheet_patterns
+        return patterns
+
+    def apply_to_options(self, options: webdriver.ChromeOptions) -> None:
+        """
+        Function that adds the launch time part of the profile to the Chrome options.
+
+        :param options: webdriver.ChromeOptions: The options the driver will be started with.
+        """
+
+        if self.images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.allowed_hosts is not None:
+            # Every other host resolves to nothing, which stops ads, analytics and web fonts before a socket is opened
+            excluded = ", ".join(f"EXCLUDE {host}" for host in self.allowed_hosts)
+            options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {excluded}")
+
+    def apply_to_driver(self, driver: webdriver.Chrome) -> None:
+        """
+        Function that installs request interception by URL pattern on a running driver.
+
+        :param driver: webdriver.Chrome: The freshly started driver.
+        """
+
+        patterns = self.url_patterns()
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+default_blocking = BlockingProfile()
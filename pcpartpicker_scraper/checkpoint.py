@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Tuple
+
+from diskcache import Cache
+
+PageKey = Tuple[str, str, Optional[str]]
+
+
+class PageCheckpoint:
+    """PageCheckpoint:
+
+    This class persists the rows of every scraped page as soon as they arrive, keyed by region, part, ECC filter and
+    page number, so that a failed part scrape can resume from the pages it is missing instead of from page one. The
+    archive digest of every page is kept next to its rows, so that a resumed listing is still complete in the archive.
+    """
+
+    def __init__(self, directory: str = "/tmp/pcpartpicker-pages/", expire: Optional[float] = None) -> None:
+        self.cache = Cache(directory)
+        # Pages older than `expire` seconds are dropped instead of being resumed into a newer scrape
+        self.expire = expire
+
+    def start(self, key: PageKey, manufacturers: List[str], page_count: int) -> Dict[int, list]:
+        """
+        Records the shape of a listing that is about to be scraped and returns the pages already stored for it.
+        Pages stored for a listing that has since changed its page count are thrown away.
+
+        :param key: PageKey: The (region, part, ECC filter) of the listing.
+        :param manufacturers: List[str]: The manufacturers of the listing.
+        :param page_count: int: The number of pages the listing has now.
+        :return: Dict[int, list]: The rows of the pages that are already stored, keyed by page number.
+        """
+
+        stored_count = self.cache.get(key + ("pages",))
+        if stored_count is not None and stored_count != page_count:
+            for page in range(1, stored_count + 1):
+                self.cache.delete(key + ("page", page))
+                self.cache.delete(key + ("digest", page))
+        tag = _tag(key)
+        self.cache.set(key + ("manufacturers",), manufacturers, expire=self.expire, tag=tag)
+        self.cache.set(key + ("pages",), page_count, expire=self.expire, tag=tag)
+        return self.stored_pages(key)
+
+    def stored_pages(self, key: PageKey) -> Dict[int, list]:
+        pages = {}
+        for page in range(1, self.cache.get(key + ("pages",), 0) + 1):
+            rows = self.cache.get(key + ("page", page))
+            if rows is not None:
+                pages[page] = rows
+        return pages
+
+    def completed(self, key: PageKey) -> Optional[Tuple[List[str], Dict[int, list]]]:
+        """
+        Returns the manufacturers and pages of a listing if every one of its pages is stored.
+        """
+
+        page_count = self.cache.get(key + ("pages",))
+        if page_count is None:
+            return None
+        pages = self.stored_pages(key)
+        if len(pages) < page_count:
+            return None
+        return self.cache.get(key + ("manufacturers",), []), pages
+
+    def stored_digests(self, key: PageKey) -> Dict[int, str]:
+        digests = {}
+        for page in range(1, self.cache.get(key + ("pages",), 0) + 1):
+            digest = self.cache.get(key + ("digest", page))
+            if digest is not None:
+                digests[page] = digest
+        return digests
+
+    def save_page(self, key: PageKey, page: int, rows: list, digest: Optional[str] = None) -> None:
+        self.cache.set(key + ("page", page), rows, expire=self.expire, tag=_tag(key))
+        if digest is not None:
+            self.cache.set(key + ("digest", page), digest, expire=self.expire, tag=_tag(key))
+
+    def discard_listing(self, key: PageKey) -> None:
+        """
+        Drops every stored page of a single listing, leaving the other ECC filters of its part alone.
+        """
+
+        for page in range(1, self.cache.get(key + ("pages",), 0) + 1):
+            self.cache.delete(key + ("page", page))
+            self.cache.delete(key + ("digest", page))
+        self.cache.delete(key + ("manufacturers",))
+        self.cache.delete(key + ("pages",))
+
+    def discard(self, region: str, part: str) -> None:
+        """
+        Drops every stored page of a part/region combo, including all of its ECC filters.
+        """
+
+        self.cache.evict(f"{region}/{part}")
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+def _tag(key: PageKey) -> str:
+    return f"{key[0]}/{key[1]}"
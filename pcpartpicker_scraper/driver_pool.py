@@ -0,0 +1,147 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+from selenium import webdriver
+
+
+class PooledDriver:
+    """PooledDriver:
+
+    A live driver owned by a DriverPool, along with the number of pages it has served.
+    """
+
+    def __init__(self, driver: webdriver.Chrome) -> None:
+        self.driver = driver
+        self.pages = 0
+
+    def get(self, url: str) -> None:
+        self.pages += 1
+        self.driver.get(url)
+
+
+class DriverPool:
+    """DriverPool:
+
+    This class keeps a bounded number of Chrome drivers alive so that they can be reused across URLs and
+    part/region combos instead of paying for a browser cold start every time.
+    """
+
+    def __init__(self, factory: Callable[[], webdriver.Chrome], max_drivers: int = 1, max_pages: int = 200) -> None:
+        self.factory = factory
+        self.max_drivers = max_drivers
+        self.max_pages = max_pages
+        self._idle: List[PooledDriver] = []
+        self._live = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def driver(self) -> Iterator[PooledDriver]:
+        """
+        Context manager that leases a driver from the pool and hands it back afterwards.
+        A driver that raised while leased is treated as crashed and is recycled.
+
+        :return: PooledDriver: The leased driver.
+        """
+
+        pooled = self.acquire()
+        try:
+            yield pooled
+        except BaseException:
+            self.release(pooled, broken=True)
+            raise
+        self.release(pooled)
+
+    def acquire(self) -> PooledDriver:
+        while True:
+            with self._condition:
+                while not self._idle and self._live >= self.max_drivers:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed!")
+                    self._condition.wait()
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed!")
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._live += 1
+            if pooled is None:
+                try:
+                    return PooledDriver(self.factory())
+                except BaseException:
+                    self._forget()
+                    raise
+            if is_healthy(pooled.driver):
+                return pooled
+            self._discard(pooled)
+
+    def release(self, pooled: PooledDriver, broken: bool = False) -> None:
+        if (broken or self._closed or pooled.pages >= self.max_pages or self._live > self.max_drivers or
+                not reset_driver(pooled.driver)):
+            self._discard(pooled)
+            return
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    def resize(self, max_drivers: int) -> None:
+        """
+        Changes how many drivers may be live at once. Surplus idle drivers are shut down straight away, and leased
+        ones are shut down as they are handed back.
+
+        :param max_drivers: int: The new cap on live drivers.
+        """
+
+        with self._condition:
+            self.max_drivers = max_drivers
+            surplus = []
+            while self._idle and self._live - len(surplus) > max_drivers:
+                surplus.append(self._idle.pop())
+            self._condition.notify_all()
+        for pooled in surplus:
+            self._discard(pooled)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def _discard(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        finally:
+            self._forget()
+
+    def _forget(self) -> None:
+        with self._condition:
+            self._live -= 1
+            self._condition.notify()
+
+
+def is_healthy(driver: webdriver.Chrome) -> bool:
+    try:
+        return driver.execute_script("return 1;") == 1 and len(driver.window_handles) > 0
+    except Exception:
+        return False
+
+
+def reset_driver(driver: webdriver.Chrome) -> bool:
+    """
+    Function that wipes cookies and web storage left behind by the previous lease and parks the driver on a blank page.
+
+    :param driver: webdriver.Chrome: The driver to reset.
+    :return: bool: Whether the driver survived the reset.
+    """
+
+    try:
+        driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,262 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .autoscale import Autoscaler
+from .history import Job, ScrapeHistory
+from .retry import CircuitBreaker, CircuitOpenError, retry
+from .scraper import Scraper, generate_part_url, generate_part_urls, merge_listings
+
+
+class TokenBucket:
+    """TokenBucket:
+
+    Paces requests to a single host. Tokens refill at `rate` per second up to `capacity`, and a caller that takes
+    more tokens than are available sleeps until the balance is paid back, so waiters are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        async with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+                self._refill()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ScrapeEngine:
+    """ScrapeEngine:
+
+    This class schedules part/region combos on an asyncio event loop. Every combo is split into one job per listing,
+    so the four ECC sweeps of memory run as separate jobs and are merged once all of them are done. When a history is
+    given, jobs are dispatched longest expected job first and idle workers pull the next one from the shared queue.
+    At most `concurrency` jobs are in flight at once, new jobs are only queued when there is room for them, and every
+    page the scraper requests is paced by a token bucket belonging to the host that serves the region. The blocking
+    Selenium work runs on a thread pool and shares the scraper's driver pool, so a handful of browser sessions serve
+    all of the in-flight combos. With an autoscaler, the number of jobs in flight and of live browser sessions is
+    adjusted while the scrape runs.
+    """
+
+    def __init__(self, scraper: Scraper, concurrency: int = 2, rate: float = 1.0, burst: float = 5,
+                 queue_size: Optional[int] = None, attempts: int = 3, failure_threshold: int = 5,
+                 reset_timeout: float = 120.0, history: Optional[ScrapeHistory] = None,
+                 autoscaler: Optional[Autoscaler] = None, autoscale_interval: float = 30.0,
+                 prices_only: Optional[bool] = None) -> None:
+        self.scraper = scraper
+        self.prices_only = prices_only
+        self.autoscaler = autoscaler
+        self.autoscale_interval = autoscale_interval
+        self.limit = concurrency
+        # Enough workers are started for the largest size the autoscaler may pick, `limit` gates how many run
+        self.concurrency = autoscaler.maximum if autoscaler is not None else concurrency
+        self.rate = rate
+        self.burst = burst
+        self.queue_size = queue_size if queue_size is not None else self.concurrency
+        self.attempts = attempts
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.history = history
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.failures: List[Tuple[str, str, BaseException]] = []
+        self.listings: Dict[Tuple[str, str], dict] = {}
+        self.active = 0
+        self.slots: Optional[asyncio.Condition] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def run(self, combos: Iterable[Tuple[str, str]],
+            on_result: Callable[[str, str, tuple], None]) -> List[Tuple[str, str, BaseException]]:
+        """
+        Scrapes every (part, region) combo and hands each result to `on_result` on the event loop thread as soon as
+        it completes, so the callback never runs concurrently with itself. A combo that still fails after all of
+        its retries is recorded and does not stop the others.
+
+        :param combos: Iterable[Tuple[str, str]]: The (part, region) combos to scrape.
+        :param on_result: Callable[[str, str, tuple], None]: Called with the part, region and scraped data.
+        :return: List[Tuple[str, str, BaseException]]: The part, region and final error of every failed combo.
+        """
+
+        self.failures = []
+        self.listings = {}
+        asyncio.run(self._run(combos, on_result))
+        return self.failures
+
+    def scrape(self, part: str, region: str, ecc_type: Optional[str] = None) -> tuple:
+        """
+        Scrapes a single listing, retrying it with jittered exponential backoff. Listings on a host whose circuit
+        is open fail straight away with a CircuitOpenError.
+        """
+
+        host = urlparse(generate_part_url(region, part)).netloc
+        breaker = self.breakers.setdefault(host, CircuitBreaker(self.failure_threshold, self.reset_timeout))
+
+        def attempt() -> tuple:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Too many recent failures from {host}")
+            try:
+                part_data = self.scraper.get_listing_data(region, part, ecc_type, self.prices_only)
+            except Exception:
+                breaker.record_failure()
+                if self.autoscaler is not None:
+                    self.autoscaler.record(error=True)
+                raise
+            breaker.record_success()
+            return part_data
+
+        with self.scraper.telemetry.labels(region, part):
+            return retry(attempt, attempts=self.attempts, base_delay=5.0, max_delay=120.0,
+                         on_retry=self.scraper.record_retry)
+
+    def throttle(self, url: str, pages: int = 1) -> None:
+        """
+        Blocks the calling scraper thread until the host of `url` may be sent `pages` more requests.
+        """
+
+        asyncio.run_coroutine_threadsafe(self._acquire(urlparse(url).netloc, pages), self.loop).result()
+
+    @contextmanager
+    def throttling(self) -> Iterator["ScrapeEngine"]:
+        """
+        Paces the scraper's requests with the engine's token buckets for callers that schedule listings themselves,
+        such as queue workers, by running the event loop the buckets need on a background thread. Listings are then
+        scraped with `scrape`, which also goes through the engine's circuit breakers.
+        """
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        self.loop = loop
+        self.scraper.throttle = self.throttle
+        try:
+            yield self
+        finally:
+            self.scraper.throttle = None
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    async def resize(self, limit: int) -> None:
+        """
+        Changes how many jobs may be in flight, and how many browser sessions may be live, from now on.
+        """
+
+        async with self.slots:
+            self.limit = limit
+            self.slots.notify_all()
+        self.scraper.pool.resize(limit)
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def _acquire(self, host: str, pages: int) -> None:
+        await self.bucket(host).acquire(pages)
+
+    async def _run(self, combos: Iterable[Tuple[str, str]], on_result: Callable[[str, str, tuple], None]) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.scraper.throttle = self.throttle
+        self.slots = asyncio.Condition()
+        self.active = 0
+        self.limit = min(self.limit, self.concurrency)
+        if self.autoscaler is not None:
+            self.scraper.pool.resize(self.limit)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            jobs = [(part, region, ecc_type)
+                    for part, region in combos for ecc_type in generate_part_urls(region, part)]
+            for part, region, _ in jobs:
+                self.listings[(part, region)] = {}
+            if self.history is not None:
+                await self._probe(self.history.unknown(jobs), executor)
+                jobs = self.history.longest_first(jobs)
+            workers = [self._worker(queue, executor, on_result) for _ in range(self.concurrency)]
+            autoscale = asyncio.ensure_future(self._autoscale()) if self.autoscaler is not None else None
+            try:
+                await asyncio.gather(self._produce(queue, jobs), *workers)
+            finally:
+                if autoscale is not None:
+                    autoscale.cancel()
+        finally:
+            # Waiting here would block the loop that in-flight scraper threads need for throttling
+            executor.shutdown(wait=False)
+
+    async def _probe(self, jobs: List[Job], executor: ThreadPoolExecutor) -> None:
+        # Listings that were never scraped fall back to their page count as a measure of their size
+        async def probe(job: Job) -> None:
+            part, region, ecc_type = job
+            try:
+                pages = await self.loop.run_in_executor(executor, self.scraper.count_pages, region, part, ecc_type)
+            except Exception:
+                return
+            self.history.record(job, pages=pages)
+
+        await asyncio.gather(*(probe(job) for job in jobs))
+
+    async def _autoscale(self) -> None:
+        while True:
+            await asyncio.sleep(self.autoscale_interval)
+            target = self.autoscaler.target(self.limit)
+            if target != self.limit:
+                print(f"Scaling from {self.limit} to {target} concurrent sessions")
+                await self.resize(target)
+
+    async def _produce(self, queue: asyncio.Queue, jobs: Iterable[Job]) -> None:
+        for job in jobs:
+            await queue.put(job)
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def _worker(self, queue: asyncio.Queue, executor: ThreadPoolExecutor,
+                      on_result: Callable[[str, str, tuple], None]) -> None:
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            part, region, ecc_type = job
+            async with self.slots:
+                await self.slots.wait_for(lambda: self.active < self.limit)
+                self.active += 1
+            started = time.perf_counter()
+            try:
+                listing = await self.loop.run_in_executor(executor, self.scrape, part, region, ecc_type)
+            except Exception as e:
+                if (part, region) in self.listings:
+                    # The other listings of a failed combo still run, their pages stay checkpointed for a rerun
+                    del self.listings[(part, region)]
+                    self.failures.append((part, region, e))
+                continue
+            finally:
+                async with self.slots:
+                    self.active -= 1
+                    self.slots.notify_all()
+            duration = time.perf_counter() - started
+            pages = self.scraper.page_counts.get((region, part, ecc_type))
+            if self.history is not None:
+                self.history.record(job, duration, pages)
+            if self.autoscaler is not None:
+                self.autoscaler.record(latency=duration / (pages or 1))
+            listings = self.listings.get((part, region))
+            if listings is None:
+                continue
+            listings[ecc_type] = listing
+            if len(listings) == len(generate_part_urls(region, part)):
+                del self.listings[(part, region)]
+                on_result(part, region, merge_listings(part, listings))
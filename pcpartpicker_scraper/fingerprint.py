@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from diskcache import Cache
+
+from .checkpoint import PageKey
+
+
+def fingerprint(rows: list) -> str:
+    """
+    Function that returns a digest of the rows of a listing page, which changes whenever any row does.
+    """
+
+    return hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()
+
+
+class ListingFingerprints:
+    """ListingFingerprints:
+
+    This class keeps the rows and fingerprints of every page of the last complete scrape of each listing, keyed by
+    (region, part, ECC filter). Unlike the scrape cache it never goes stale, so that a listing that has not
+    changed since can be confirmed from a few of its pages and the rest reused.
+    """
+
+    def __init__(self, directory: str = os.path.expanduser("~/pcpartpicker-fingerprints/")) -> None:
+        self.cache = Cache(directory)
+
+    def get(self, key: PageKey) -> Optional[dict]:
+        return self.cache.get(key)
+
+    def save(self, key: PageKey, manufacturers: List[str], pages: Dict[int, list],
+             digests: Optional[Dict[int, str]] = None) -> None:
+        self.cache[key] = {
+            "manufacturers": manufacturers,
+            "page_count": len(pages),
+            "fingerprints": {page: fingerprint(rows) for page, rows in pages.items()},
+            "pages": pages,
+            "digests": digests or {},
+        }
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+def matches_stored(stored: Optional[dict], page_count: int, pages: Dict[int, list]) -> bool:
+    """
+    Function that checks whether the pages scraped so far are identical to the stored scrape of their listing.
+
+    :param stored: Optional[dict]: The stored scrape of the listing, if there is one.
+    :param page_count: int: The number of pages the listing has now.
+    :param pages: Dict[int, list]: The rows of the pages scraped so far, keyed by page number.
+    :return: bool: Whether the listing has the same number of pages and every scraped page is unchanged.
+    """
+
+    if stored is None or stored["page_count"] != page_count:
+        return False
+    return all(stored["fingerprints"].get(page) == fingerprint(rows) for page, rows in pages.items())
@@ -0,0 +1,96 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from diskcache import Cache
+
+Job = Tuple[str, str, Optional[str]]
+
+
+class ScrapeHistory:
+    """ScrapeHistory:
+
+    This class remembers how long each listing took to scrape and how many pages it had, so that the longest jobs can
+    be started first on the next run. Jobs are keyed by (part, region, ECC filter), and unlike the scrape cache the
+    history never goes stale.
+    """
+
+    default_seconds_per_page: float = 2.0
+
+    def __init__(self, directory: str = os.path.expanduser("~/pcpartpicker-history/")) -> None:
+        self.cache = Cache(directory)
+
+    def record(self, job: Job, duration: Optional[float] = None, pages: Optional[int] = None) -> None:
+        entry = self.cache.get(job, {})
+        if duration is not None:
+            entry["duration"] = duration
+        if pages is not None:
+            entry["pages"] = pages
+        self.cache[job] = entry
+
+    def record_full_scrape(self, part: str, region: str, needed: bool) -> None:
+        """
+        Remembers whether a region listed products that the primary region of a planned scrape does not, so that the
+        next planned scrape of the combo goes straight to a full scrape instead of a price pass it cannot use.
+        """
+
+        self.cache[("full", part, region)] = {"needed": needed}
+
+    def needs_full_scrape(self, part: str, region: str) -> bool:
+        return self.cache.get(("full", part, region), {}).get("needed", False)
+
+    def duration(self, job: Job) -> Optional[float]:
+        return self.cache.get(job, {}).get("duration")
+
+    def pages(self, job: Job) -> Optional[int]:
+        return self.cache.get(job, {}).get("pages")
+
+    def seconds_per_page(self) -> float:
+        """
+        Returns the average scrape time of a page over every job with a known duration and page count.
+        """
+
+        total_duration = 0.0
+        total_pages = 0
+        for job in self.cache:
+            entry = self.cache.get(job, {})
+            if "duration" in entry and entry.get("pages"):
+                total_duration += entry["duration"]
+                total_pages += entry["pages"]
+        if not total_pages:
+            return self.default_seconds_per_page
+        return total_duration / total_pages
+
+    def estimate(self, job: Job, seconds_per_page: Optional[float] = None) -> Optional[float]:
+        """
+        Returns the expected duration of a job, either as recorded or derived from its page count.
+
+        :param job: Job: The (part, region, ECC filter) job.
+        :param seconds_per_page: Optional[float]: The page rate to use for jobs that only have a page count.
+        :return: Optional[float]: The expected duration in seconds, or None if nothing is known about the job.
+        """
+
+        duration = self.duration(job)
+        if duration is not None:
+            return duration
+        pages = self.pages(job)
+        if pages is None:
+            return None
+        if seconds_per_page is None:
+            seconds_per_page = self.seconds_per_page()
+        return pages * seconds_per_page
+
+    def unknown(self, jobs: Iterable[Job]) -> List[Job]:
+        return [job for job in jobs if self.estimate(job, 0.0) is None]
+
+    def longest_first(self, jobs: Iterable[Job]) -> List[Job]:
+        """
+        Orders jobs by expected duration, longest first, which is the LPT rule for list scheduling.
+        Jobs without any history are started last.
+        """
+
+        seconds_per_page = self.seconds_per_page()
+        estimates: Dict[Job, float] = {}
+        for job in jobs:
+            estimate = self.estimate(job, seconds_per_page)
+            estimates[job] = estimate if estimate is not None else -1.0
+        return sorted(estimates, key=lambda job: (-estimates[job], job[0], job[1], job[2] or ""))
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+from diskcache import Cache
+
+
+def raw_digest(part_data: tuple) -> str:
+    """
+    Function that hashes the raw (manufacturers, rows) of a combo independently of the order of either list, since
+    both are collected through sets and come out in a different order every run.
+    """
+
+    manufacturers, rows = part_data
+    content = json.dumps([sorted(manufacturers), sorted(json.dumps(row) for row in rows)])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def write_atomic(path: str, text: str) -> str:
+    """
+    Function that replaces a file through a temporary file and a rename, so that readers never see a partial file.
+    A file that already has the same content is left untouched.
+
+    :param path: str: The file to write.
+    :param text: str: The new content.
+    :return: str: The digest of the content.
+    """
+
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    if file_digest(path) == digest:
+        return digest
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+    return digest
+
+
+class PublishManifest:
+    """PublishManifest:
+
+    This class remembers, for every published part/region file, the digest of the raw data it was built from and
+    the digest of the file that was written. A combo whose raw data is unchanged and whose file is still the one
+    that was written does not have to be parsed, serialized, validated or written again.
+    """
+
+    def __init__(self, directory: str = os.path.expanduser("~/pcpartpicker-published/")) -> None:
+        self.cache = Cache(directory)
+
+    def is_current(self, region: str, part: str, input_digest: str, path: str) -> bool:
+        entry = self.cache.get((region, part))
+        return entry is not None and entry["input"] == input_digest and entry["output"] == file_digest(path)
+
+    def record(self, region: str, part: str, input_digest: str, output_digest: str) -> None:
+        self.cache[(region, part)] = {"input": input_digest, "output": output_digest}
+
+    def clear(self) -> None:
+        self.cache.clear()
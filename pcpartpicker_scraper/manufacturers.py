@@ -0,0 +1,38 @@
+import os
+from typing import Iterable, List, Optional
+
+from diskcache import Cache
+
+
+def resolves(name: Optional[str], manufacturers: Iterable[str]) -> bool:
+    """
+    Function that checks whether a product name starts with one of the manufacturers, the same way
+    Parser.retrieve_brand_info splits it into brand and model.
+    """
+
+    if not name:
+        return True
+    return any(name == manufacturer or name.startswith(manufacturer + " ") for manufacturer in manufacturers)
+
+
+class ManufacturerCache:
+    """ManufacturerCache:
+
+    This class keeps the manufacturer filter list of every part and region for `ttl` seconds, so that a listing only
+    has to read it from the page when the list is missing, has expired, or no longer covers a product on the listing.
+    Every ECC filter of a memory listing narrows its manufacturer list, so each filter has an entry of its own.
+    """
+
+    def __init__(self, directory: str = os.path.expanduser("~/pcpartpicker-manufacturers/"),
+                 ttl: float = 30 * 24 * 60 * 60) -> None:
+        self.cache = Cache(directory)
+        self.ttl = ttl
+
+    def get(self, region: str, part: str, ecc_type: Optional[str] = None) -> Optional[List[str]]:
+        return self.cache.get((region, part, ecc_type))
+
+    def set(self, region: str, part: str, manufacturers: List[str], ecc_type: Optional[str] = None) -> None:
+        self.cache.set((region, part, ecc_type), manufacturers, expire=self.ttl)
+
+    def clear(self) -> None:
+        self.cache.clear()
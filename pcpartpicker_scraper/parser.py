@@ -5,6 +5,7 @@ from typing import List, Tuple, Optional
 import lxml.html
 from moneyed import USD
 
+from .brands import brands
 from .mappings import currency_classes, currency_symbols, part_classes, \
     none_symbols
 from .parse_utils import part_funcs
@@ -101,20 +102,22 @@ class Parser:
             return Money(re.findall(num_pattern, price)[0], self.currency)
 
     def retrieve_brand_info(self, brand_information: str) -> Tuple[Optional[str], Optional[str]]:
-        for x in range(len(brand_information) + 1):
-            if brand_information[:x] in self.manufacturers:
-                try:
-                    next_char = brand_information[x]
-                    if not next_char == " ":
-                        continue
-                    raise IndexError
-                except IndexError:
-                    brand = brand_information[:x].strip().lstrip()
-                    model = brand_information[x:].strip().lstrip()
-                    if not model:
-                        return brand, None
-                    else:
-                        return brand, model
+        # Fall back to every known brand when the scraped manufacturer list is missing or out of date
+        for manufacturers in (self.manufacturers, brands):
+            for x in range(len(brand_information) + 1):
+                if brand_information[:x] in manufacturers:
+                    try:
+                        next_char = brand_information[x]
+                        if not next_char == " ":
+                            continue
+                        raise IndexError
+                    except IndexError:
+                        brand = brand_information[:x].strip().lstrip()
+                        model = brand_information[x:].strip().lstrip()
+                        if not model:
+                            return brand, None
+                        else:
+                            return brand, model
 
 
 def find_products(html: str) -> list:
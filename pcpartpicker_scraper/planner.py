@@ -0,0 +1,128 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from .parse_utils import part_funcs
+from .utils import num_pattern
+
+Combo = Tuple[str, str]
+
+T = TypeVar("T")
+
+
+def split_by_region(combos: Iterable[Combo], primary: str) -> Tuple[List[Combo], List[Combo]]:
+    """
+    Function that splits (part, region) combos into the ones whose specs are scraped in full, which are the combos of
+    the primary region, and the ones that only need their prices.
+    """
+
+    combos = list(combos)
+    return [combo for combo in combos if combo[1] == primary], [combo for combo in combos if combo[1] != primary]
+
+
+def identity(part: str, row: tuple) -> tuple:
+    # Memory is scraped once per ECC filter, so the same name can be listed once for every kind of ECC support
+    if part == "memory":
+        return row[0], row[-2]
+    return row[0],
+
+
+def price_columns(part: str) -> List[int]:
+    # The row index of every spec column that holds a price, such as the price per GB of memory and drives
+    return [index + 1 for index, func in enumerate(part_funcs.get(part, [])) if func.__name__ == "price"]
+
+
+def amount(price: Optional[str]) -> Optional[float]:
+    numbers = re.findall(num_pattern, price.replace(",", "")) if price else []
+    return float(numbers[0]) if numbers else None
+
+
+def regional_spec(spec: tuple, columns: List[int], primary_price: Optional[str], price: Optional[str],
+                  symbol: Optional[str]) -> tuple:
+    """
+    Function that converts the price columns of a spec row of the primary region to a region, by scaling them with
+    the ratio of the two prices of the product, the same way prices.set_price scales the price per GB. Columns that
+    cannot be converted are left empty, which the parser reads as no price.
+    """
+
+    if not columns:
+        return spec
+    primary_amount = amount(primary_price)
+    regional_amount = amount(price)
+    spec = list(spec)
+    for column in (column for column in columns if column < len(spec)):
+        column_amount = amount(spec[column])
+        if symbol is None or not primary_amount or regional_amount is None or column_amount is None:
+            spec[column] = ""
+        else:
+            spec[column] = f"{symbol}{column_amount * regional_amount / primary_amount:.3f}"
+    return tuple(spec)
+
+
+def join_prices(part: str, spec_rows: Iterable[tuple], price_rows: Iterable[tuple],
+                symbol: Optional[str] = None) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Function that builds the full rows of a region from the spec rows of the primary region and the price rows of
+    the region, joined on the product name and, for memory, the ECC filter. Spec columns that hold a price in the
+    currency of the primary region are converted to the region.
+
+    :param part: str: The part type.
+    :param spec_rows: Iterable[tuple]: The full rows of the part in the primary region.
+    :param price_rows: Iterable[tuple]: The (name, price) rows of the region, with the ECC filter before the price
+        for memory.
+    :param symbol: Optional[str]: The currency symbol of the region. Without it, price columns are left empty.
+    :return: Tuple[List[tuple], List[tuple]]: The joined rows, and the price rows that have no spec row in the primary
+        region or match several different ones.
+    """
+
+    columns = price_columns(part)
+    specs = defaultdict(dict)
+    for row in spec_rows:
+        specs[identity(part, row)][row[:-1]] = row[-1]
+    joined = []
+    unmatched = []
+    for row in price_rows:
+        candidates = specs.get(tuple(row[:-1]), {})
+        if len(candidates) == 1:
+            spec, primary_price = next(iter(candidates.items()))
+            joined.append(regional_spec(spec, columns, primary_price, row[-1], symbol) + (row[-1],))
+        else:
+            unmatched.append(row)
+    return joined, unmatched
+
+
+def has_exclusives(part: str, spec_rows: Iterable[tuple], rows: Iterable[tuple]) -> bool:
+    """
+    Function that checks whether the full rows of a region list any product that cannot be joined onto the spec rows
+    of the primary region, which a price-only scrape of the region could not fill in.
+    """
+
+    _, unmatched = join_prices(part, spec_rows, [identity(part, row) + (row[-1],) for row in rows])
+    return bool(unmatched)
+
+
+def chunk_by_size(items: Iterable[T], sizes: Dict[T, float], target: float) -> List[List[T]]:
+    """
+    Function that groups work items into chunks of roughly `target` total size, largest items first, so that the
+    largest chunks are handed out first and small items share the overhead of a chunk. Items larger than `target`
+    get a chunk of their own. The result only depends on the items and their sizes.
+
+    :param items: Iterable[T]: The work items, which must be sortable.
+    :param sizes: Dict[T, float]: The estimated size of every item.
+    :param target: float: The size to aim for per chunk.
+    :return: List[List[T]]: The chunks, largest first.
+    """
+
+    chunks = []
+    chunk = []
+    chunk_size = 0.0
+    for item in sorted(items, key=lambda x: (-sizes[x], x)):
+        chunk.append(item)
+        chunk_size += sizes[item]
+        if chunk_size >= target:
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0.0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
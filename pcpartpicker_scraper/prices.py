@@ -0,0 +1,70 @@
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+PriceParser = Callable[[Optional[str]], Optional[list]]
+
+
+def product_name(item: dict) -> str:
+    """
+    Function that rebuilds the name a product is listed under from the brand and model it was parsed into.
+    """
+
+    return " ".join(x for x in (item["brand"], item["model"]) if x)
+
+
+def item_key(part: str, item: dict) -> tuple:
+    # Memory is scraped once per ECC filter, so the same name can be listed once for every kind of ECC support
+    if part == "memory":
+        return product_name(item), item["error_correction"]
+    return product_name(item),
+
+
+def refresh_prices(part: str, snapshot: List[dict], rows: List[tuple],
+                   parse_price: PriceParser) -> Tuple[List[dict], Dict[str, int]]:
+    """
+    Function that updates the prices of an earlier snapshot of a part from freshly scraped price rows, keeping
+    every spec as it is. Products that are no longer listed get a price of zero, the same as products without any
+    price. Products that share a name are only updated if the listing still has as many of them as the snapshot.
+
+    :param part: str: The part type.
+    :param snapshot: List[dict]: The products of the last full scrape, as serialized dicts.
+    :param rows: List[tuple]: The (name, price) rows of the listing, with the ECC filter before the price for memory.
+    :param parse_price: PriceParser: Turns a raw price into its serialized [amount, currency] form.
+    :return: Tuple[List[dict], Dict[str, int]]: The refreshed products, and how many were updated, became
+        unavailable, were ambiguous, or are new and have to wait for the next full scrape.
+    """
+
+    listed = defaultdict(list)
+    for row in rows:
+        listed[tuple(row[:-1])].append(row[-1])
+    known = defaultdict(list)
+    for index, item in enumerate(snapshot):
+        known[item_key(part, item)].append(index)
+
+    refreshed = [dict(item) for item in snapshot]
+    stats = {"updated": 0, "unavailable": 0, "ambiguous": 0, "new": 0}
+    for key, indices in known.items():
+        prices = listed.get(key)
+        if prices is None:
+            prices = [None] * len(indices)
+            stats["unavailable"] += len(indices)
+        elif len(prices) != len(indices):
+            stats["ambiguous"] += len(indices)
+            continue
+        else:
+            stats["updated"] += len(indices)
+        for index, price in zip(indices, prices):
+            set_price(refreshed[index], parse_price(price))
+    stats["new"] = sum(len(prices) for key, prices in listed.items() if key not in known)
+    return refreshed, stats
+
+
+def set_price(item: dict, price: Optional[list]) -> None:
+    if price is None:
+        return
+    old_price = item.get("price")
+    # The per-GB price of memory and drives is not scraped again, so it follows the total price
+    if item.get("price_per_gb") and old_price and float(old_price[0]):
+        ratio = float(price[0]) / float(old_price[0])
+        item["price_per_gb"] = [f"{float(item['price_per_gb'][0]) * ratio:.2f}", price[1]]
+    item["price"] = price
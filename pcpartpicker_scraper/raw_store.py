@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from diskcache import Cache
+
+
+class RawStore:
+    """RawStore:
+
+    This class holds the raw (manufacturers, rows) result of every scraped part/region combo under its own
+    (region, part) key. Storing a combo is a single transactional write that never touches the other combos, so
+    concurrent writers cannot overwrite each other and the cost of a write does not grow with the region. Every combo
+    also records when it was scraped and the digest of the code that scraped it, which decide whether it is fresh,
+    and the price rows of any price-only refresh since, which are applied on top of it when it is published.
+    """
+
+    def __init__(self, directory: str = "/tmp/pcpartpicker-cache/") -> None:
+        self.cache = Cache(directory)
+
+    def __contains__(self, combo: Tuple[str, str]) -> bool:
+        region, part = combo
+        return (region, part) in self.cache
+
+    def get(self, region: str, part: str) -> Optional[tuple]:
+        return self.cache.get((region, part))
+
+    def put(self, region: str, part: str, part_data: tuple, code: Optional[str] = None,
+            now: Optional[datetime] = None) -> None:
+        with self.cache.transact():
+            self.cache.set((region, part), part_data)
+            self.cache.set(("meta", region, part), {"time": now or datetime.now(), "code": code})
+            # A full scrape has newer prices than any earlier refresh
+            self.cache.delete(("prices", region, part))
+
+    def get_prices(self, region: str, part: str) -> Optional[list]:
+        return self.cache.get(("prices", region, part))
+
+    def put_prices(self, region: str, part: str, rows: list) -> None:
+        """
+        Stores the (name, price) rows of a price-only refresh of a stored combo, without changing its rows or when
+        it was scraped.
+        """
+
+        self.cache.set(("prices", region, part), rows)
+
+    def is_fresh(self, region: str, part: str, code: str, max_age: timedelta,
+                 now: Optional[datetime] = None) -> bool:
+        """
+        Checks whether a combo is stored, was scraped less than `max_age` ago, and was scraped by code with the given
+        digest. Combos stored before digests were recorded are accepted under any digest.
+        """
+
+        meta = self.cache.get(("meta", region, part))
+        if meta is None or (region, part) not in self.cache:
+            return False
+        if meta["code"] is not None and meta["code"] != code:
+            return False
+        return (now or datetime.now()) - meta["time"] < max_age
+
+    def combos(self) -> List[Tuple[str, str]]:
+        """
+        Returns the (region, part) key of every stored combo, without loading any data.
+        """
+
+        return sorted(key for key in self.cache.iterkeys() if isinstance(key, tuple) and len(key) == 2)
+
+    def items(self) -> Iterator[Tuple[str, str, tuple]]:
+        """
+        Yields the region, part and data of every stored combo, loading one combo at a time.
+        """
+
+        for region, part in self.combos():
+            part_data = self.get(region, part)
+            if part_data is not None:
+                yield region, part, part_data
+
+    def needs_migration(self) -> bool:
+        return any(isinstance(key, str) for key in self.cache.iterkeys())
+
+    def migrate(self) -> None:
+        """
+        Moves combos stored by older versions in one dict per region, or under a single store-wide timestamp, to their
+        own keys.
+        """
+
+        timestamp = self.cache.get("timestamp", datetime.now())
+        for key in list(self.cache.iterkeys()):
+            if isinstance(key, str) and key != "timestamp":
+                with self.cache.transact():
+                    for part, part_data in self.cache.get(key, {}).items():
+                        self.cache.set((key, part), part_data)
+                    self.cache.delete(key)
+        for region, part in self.combos():
+            if ("meta", region, part) not in self.cache:
+                self.cache.set(("meta", region, part), {"time": timestamp, "code": None})
+        self.cache.delete("timestamp")
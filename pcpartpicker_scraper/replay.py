@@ -0,0 +1,252 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .checkpoint import PageKey
+
+# A stand-in for a product list page. The rows of every recorded page are embedded in the page and rendered from the
+# URL hash, so that pagination and ECC filters behave like the client-side ones on pcpartpicker.com.
+page_template = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8">
+    <title>Replay</title>
+  </head>
+  <body>
+    <ul id="m_set"></ul>
+    <table><tbody id="products"></tbody></table>
+    <div id="module-pagination"><ul id="pagination"></ul></div>
+    <script>
+var fixture = {fixture};
+var renderDelay = {render_delay};
+
+function cell(className, text) {{
+    var element = document.createElement(className === 'td__name' ? 'p' : 'td');
+    if (text !== null) {{
+        element.appendChild(document.createTextNode(text));
+    }}
+    if (className !== 'td__name') {{
+        element.className = className;
+        return element;
+    }}
+    var wrapper = document.createElement('div');
+    wrapper.className = 'td__nameWrapper';
+    wrapper.appendChild(element);
+    var link = document.createElement('a');
+    link.appendChild(wrapper);
+    var td = document.createElement('td');
+    td.className = 'td__name';
+    td.appendChild(link);
+    return td;
+}}
+
+function listing(hash) {{
+    var params = hash.replace(/^#/, '').split('&');
+    var page = 1;
+    var filter = '';
+    for (var i = 0; i < params.length; i++) {{
+        if (params[i].indexOf('page=') === 0) {{
+            page = parseInt(params[i].substring(5), 10);
+        }} else if (params[i] && fixture.listings[params[i]] !== undefined) {{
+            filter = params[i];
+        }}
+    }}
+    return {{listing: fixture.listings[filter] || {{pages: {{}}}}, page: page}};
+}}
+
+function render() {{
+    var current = listing(window.location.hash);
+    var rows = current.listing.pages[current.page] || [];
+    var body = document.createElement('tbody');
+    body.id = 'products';
+    for (var i = 0; i < rows.length; i++) {{
+        var tr = document.createElement('tr');
+        tr.className = 'tr__product';
+        var row = rows[i];
+        tr.appendChild(cell('td__name', row[0]));
+        for (var j = 1; j < row.length - 1; j++) {{
+            tr.appendChild(cell('td__spec', row[j]));
+        }}
+        tr.appendChild(cell('td__price', row[row.length - 1]));
+        body.appendChild(tr);
+    }}
+    var old = document.getElementById('products');
+    old.parentNode.replaceChild(body, old);
+
+    var pagination = document.getElementById('pagination');
+    pagination.innerHTML = '';
+    var count = Object.keys(current.listing.pages).length;
+    for (var page = 1; page <= count; page++) {{
+        var li = document.createElement('li');
+        var a = document.createElement('a');
+        a.href = '#page=' + page;
+        a.appendChild(document.createTextNode(String(page)));
+        li.appendChild(a);
+        pagination.appendChild(li);
+    }}
+}}
+
+(function manufacturers() {{
+    var list = document.getElementById('m_set');
+    for (var i = 0; i < fixture.manufacturers.length; i++) {{
+        var li = document.createElement('li');
+        li.id = 'li_' + i;
+        var label = document.createElement('label');
+        label.appendChild(document.createTextNode(fixture.manufacturers[i]));
+        li.appendChild(label);
+        list.appendChild(li);
+    }}
+    var more = document.createElement('a');
+    more.appendChild(document.createTextNode('Show more'));
+    list.appendChild(more);
+}})();
+
+window.addEventListener('hashchange', function () {{
+    setTimeout(render, renderDelay);
+}});
+render();
+    </script>
+  </body>
+</html>"""
+
+
+def fixture_path(directory: str, region: str, part: str) -> str:
+    return os.path.join(directory, region, part + ".json")
+
+
+def url_filter(url: str) -> str:
+    """
+    Function that returns the filter a listing URL applies through its hash, such as "E=0", or "" for none.
+    """
+
+    return "&".join(param for param in urlsplit(url).fragment.split("&") if param and not param.startswith("page="))
+
+
+class FixtureRecorder:
+    """FixtureRecorder:
+
+    This class writes the manufacturers and the rows of every page of the listings a scraper completes into replay
+    fixtures, one JSON file per region and part with a listing per ECC filter.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def save(self, key: PageKey, url: str, manufacturers: List[str], pages: Dict[int, list]) -> None:
+        region, part, ecc_type = key
+        path = fixture_path(self.directory, region, part)
+        with self._lock:
+            fixture = load_fixture(path) if os.path.exists(path) else {"manufacturers": [], "listings": {}}
+            fixture["manufacturers"] = sorted(set(fixture["manufacturers"]) | set(manufacturers))
+            fixture["listings"][url_filter(url)] = {
+                "ecc_type": ecc_type,
+                "pages": {str(page): [list(row) for row in rows] for page, rows in sorted(pages.items())},
+            }
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(fixture, file)
+
+
+def load_fixture(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def find_fixtures(directory: str) -> List[Tuple[str, str]]:
+    """
+    Function that returns the (part, region) combo of every fixture in a directory.
+    """
+
+    combos = []
+    for region in sorted(os.listdir(directory)):
+        if not os.path.isdir(os.path.join(directory, region)):
+            continue
+        for file_name in sorted(os.listdir(os.path.join(directory, region))):
+            if file_name.endswith(".json"):
+                combos.append((file_name[:-len(".json")], region))
+    return combos
+
+
+class ReplayServer:
+    """ReplayServer:
+
+    This class serves recorded fixtures over HTTP at <root>/<region>/products/<part>/ on localhost, so that a scraper
+    created with `url_root=server.root` runs end to end without contacting pcpartpicker.com.
+    """
+
+    def __init__(self, directory: str, port: int = 0, latency: float = 0.0, render_delay: int = 0) -> None:
+        """
+        :param directory: str: The fixture directory.
+        :param port: int: The port to listen on, or 0 for any free port.
+        :param latency: float: Seconds to wait before answering every request, to emulate the network.
+        :param render_delay: int: Milliseconds between a hash change and the new rows, to emulate the site's scripts.
+        """
+
+        self.directory = directory
+        self.latency = latency
+        self.render_delay = render_delay
+        self._pages: Dict[Tuple[str, str], bytes] = {}
+        self._server = ThreadingHTTPServer(("localhost", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def root(self) -> str:
+        return f"http://localhost:{self._server.server_address[1]}"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def page(self, region: str, part: str) -> Optional[bytes]:
+        if (region, part) not in self._pages:
+            path = fixture_path(self.directory, region, part)
+            if not os.path.exists(path):
+                return None
+            fixture = json.dumps(load_fixture(path)).replace("</", "<\\/")
+            html = page_template.format(fixture=fixture, render_delay=self.render_delay)
+            self._pages[(region, part)] = html.encode("utf-8")
+        return self._pages[(region, part)]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                parts = [part for part in urlsplit(self.path).path.split("/") if part]
+                body = None
+                if len(parts) == 3 and parts[1] == "products":
+                    body = server.page(parts[0], parts[2])
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+from typing import Callable, Iterator, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit for its host is open."""
+
+
+def backoff_delays(attempts: int, base_delay: float = 1.0, max_delay: float = 60.0) -> Iterator[float]:
+    """
+    Generator that yields full-jitter exponential backoff delays for the retries that follow a first attempt.
+
+    :param attempts: int: The total number of attempts, including the first one.
+    :param base_delay: float: The upper bound of the first delay in seconds.
+    :param max_delay: float: The largest upper bound any delay may have.
+    :return: Iterator[float]: One delay per retry.
+    """
+
+    for attempt in range(attempts - 1):
+        yield random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry(func: Callable[[], T], attempts: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+          exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+          sleep: Callable[[float], None] = time.sleep,
+          on_retry: Optional[Callable[[BaseException, float], None]] = None) -> T:
+    """
+    Function that calls `func` until it succeeds, sleeping a jittered, exponentially growing delay between attempts.
+    The exception of the last attempt is raised if every attempt fails.
+
+    :param func: Callable[[], T]: The function to call.
+    :param attempts: int: The total number of attempts.
+    :param base_delay: float: The upper bound of the first delay in seconds.
+    :param max_delay: float: The largest upper bound any delay may have.
+    :param exceptions: Tuple[Type[BaseException], ...]: The exceptions that are worth retrying.
+    :param sleep: Callable[[float], None]: Sleep function, replaceable for testing.
+    :param on_retry: Optional[Callable[[BaseException, float], None]]: Called with the error and delay of every retry.
+    :return: T: The result of the first successful call.
+    """
+
+    delays = backoff_delays(attempts, base_delay, max_delay)
+    while True:
+        try:
+            return func()
+        except CircuitOpenError:
+            raise
+        except exceptions as e:
+            delay = next(delays, None)
+            if delay is None:
+                raise
+            if on_retry is not None:
+                on_retry(e, delay)
+        sleep(delay)
+
+
+class CircuitBreaker:
+    """CircuitBreaker:
+
+    Stops requests to a host after `failure_threshold` consecutive failures. Once `reset_timeout` seconds have passed
+    a single trial request is let through, and its outcome either closes the circuit again or keeps it open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 120.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if not self._trial and self.clock() - self.opened_at >= self.reset_timeout:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial = False
@@ -1,154 +1,491 @@
+import itertools
+import json
+import logging
 import random
-import time
-from typing import List
+import threading
+from typing import Callable, Dict, List, Optional
 
-import lxml.html
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.support.wait import WebDriverWait
 
-from .parser import find_products
+from .archive import PageArchive
+from .blocking import BlockingProfile, default_blocking
+from .checkpoint import PageCheckpoint, PageKey
+from .driver_pool import DriverPool
+from .fingerprint import ListingFingerprints, matches_stored
+from .manufacturers import ManufacturerCache, resolves
+from .replay import FixtureRecorder
+from .retry import retry
+from .scripts import DOM_SIZE, HARVEST_DONE, HARVEST_RESULT, MANUFACTURERS, PAGE_NUMBERS, PRICE_CELLS, \
+    PRODUCT_CELLS, PRODUCTS, START_HARVEST, TABLE_FRAGMENT, TABLE_SIGNATURE
+from .tabs import TabController
+from .telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.WARN)
 
 
 class Scraper:
     current_region = None
     browser = None
 
-    def __init__(self, executable_path: str):
+    def __init__(self, executable_path: str, max_drivers: int = 1, max_pages: int = 200, harvest: bool = True,
+                 blocking: Optional[BlockingProfile] = default_blocking,
+                 throttle: Optional[Callable[[str, int], None]] = None, harvest_chunk: int = 10,
+                 checkpoint: Optional[PageCheckpoint] = None, page_attempts: int = 3, tabs: bool = False,
+                 telemetry: Optional[Telemetry] = None, prices_only: bool = False,
+                 fingerprints: Optional[ListingFingerprints] = None, confirm_pages: int = 2,
+                 manufacturer_cache: Optional[ManufacturerCache] = None, url_root: Optional[str] = None,
+                 recorder: Optional[FixtureRecorder] = None, archive: Optional[PageArchive] = None):
         self.executable_path = executable_path
+        self.harvest = harvest
+        self.harvest_chunk = harvest_chunk
+        self.blocking = blocking
+        self.throttle = throttle
+        self.checkpoint = checkpoint
+        self.page_attempts = page_attempts
+        self.page_counts: Dict[PageKey, int] = {}
+        self.fingerprints = fingerprints
+        self.confirm_pages = confirm_pages
+        self.manufacturer_cache = manufacturer_cache
+        self.url_root = url_root
+        self.recorder = recorder
+        self.archive = archive
+        self.telemetry = telemetry if telemetry is not None else Telemetry()
+        # A price refresh only reads the name and price cells and skips the manufacturer list
+        self.prices_only = prices_only
+        # In tab mode the pool hands out tabs of one shared browser instead of whole browsers
+        self.tabs = tabs
+        self.controller: Optional[TabController] = None
+        self.controller_lock = threading.Lock()
+        factory = self.open_tab if tabs else self.get_driver
+        self.pool = DriverPool(factory, max_drivers=max_drivers, max_pages=max_pages)
+
+    def close(self) -> None:
+        self.pool.close()
+        with self.controller_lock:
+            if self.controller is not None:
+                self.controller.quit()
+                self.controller = None
 
-    def get_part_data(self, region: str, part: str) -> tuple:
+    def get_part_data(self, region: str, part: str, prices_only: Optional[bool] = None) -> tuple:
         try:
-            base_url = generate_part_url(region, part)
-
-            # For memory parts we want to add property that isn't readily available from the data-set:
-            # The type of ECC support the memory module has
-            # For this purpose, we will query the memory URL 4 times, once per each ECC option on the search page
-            # Every time we complete reading a result set, we will merge it to a global/total list of memory modules, not before
-            # we populate a "fake" property indicating what ECC support the module has:
-            if part == "memory":
-                urls = {
-                    "Non-ECC / Unbuffered": base_url + "#E=0",
-                    "Non-ECC / Registered" : base_url + "#E=10",
-                    "ECC / Unbuffered": base_url + "#E=1",
-                    "ECC / Registered": base_url + "#E=11",
-                }
-
-                total_manufacturers_set = set()
-                total_product_set = set()
-
-                for ecc_type, url in urls.items():
-                    # This will generate a result-set per ECC type
-                    manufacturers, product_set = self.get_part_data_for_url(url)
-                    # This will merge the manufacturer list from the per-ECC query back to the final
-                    # list of manufacturers
-                    total_manufacturers_set = total_manufacturers_set | set(manufacturers)
-                    # Before we merge the per-ECC product list back with the global list,
-                    # We have to add the ecc_type back to the tuple so that it would "appear" as if the scraped data
-                    # had the ecc information embedded in it organically
-                    product_set = set(map(lambda t: t[:-1] + (ecc_type,) + t[-1:], product_set))
-                    # Merge the product list
-                    total_product_set = total_product_set | set(product_set)
-
-                # Finally, we return the memory manufacturer+product list as if they were 
-                # all generated from a single scraping session
-                return list(total_manufacturers_set), list(total_product_set)
-            else:
-                return self.get_part_data_for_url(base_url)
+            listings = {}
+            for ecc_type in generate_part_urls(region, part):
+                listings[ecc_type] = self.get_listing_data(region, part, ecc_type, prices_only)
+            return merge_listings(part, listings)
         except Exception:
             print(f"Failed to scrape {region}/{part}")
             raise
 
+    def get_listing_data(self, region: str, part: str, ecc_type: Optional[str] = None,
+                         prices_only: Optional[bool] = None) -> tuple:
+        """
+        Scrapes a single listing of a part, which is either the whole part or one of its ECC filtered sweeps.
+        With `prices_only`, which defaults to the mode of the scraper, only names and prices are read.
+        """
+
+        url = generate_part_urls(region, part, self.url_root)[ecc_type]
+        with self.telemetry.labels(region, part):
+            return self.get_part_data_for_url(url, (region, part, ecc_type), prices_only)
+
+    def count_pages(self, region: str, part: str, ecc_type: Optional[str] = None) -> int:
+        """
+        Loads the first page of a listing and returns how many pages it has.
+        """
+
+        url = generate_part_urls(region, part, self.url_root)[ecc_type]
+        with self.telemetry.labels(region, part), self.pool.driver() as pooled:
+            self.wait_for_turn(url)
+            with self.telemetry.timer("driver_get_seconds"):
+                pooled.get(url)
+            page_count = get_number_of_pages(pooled.driver)
+        self.page_counts[(region, part, ecc_type)] = page_count
+        return page_count
+
+    def get_part_data_for_url(self, url: str, key: Optional[PageKey] = None,
+                              prices_only: Optional[bool] = None) -> tuple:
+        prices_only = self.prices_only if prices_only is None else prices_only
+        cells = PRICE_CELLS if prices_only else PRODUCT_CELLS
+        # Price rows are never stored where the full rows of the same listing could be read back
+        stored_key = key if not prices_only else None
+        checkpoint = self.checkpoint if stored_key is not None else None
+        if checkpoint is not None:
+            completed = checkpoint.completed(key)
+            if completed is not None:
+                manufacturers, pages = completed
+                self.page_counts[key] = len(pages)
+                if self.archive is not None:
+                    self.archive_resumed(key, pages, {})
+                    self.archive.record_listing(key, manufacturers, len(pages))
+                return manufacturers, merge_pages(pages)
+
+        with self.pool.driver() as pooled:
+            driver = pooled.driver
+            self.wait_for_turn(url)
+            with self.telemetry.timer("driver_get_seconds"):
+                pooled.get(url)
+            with self.telemetry.timer("wait_seconds"):
+                wait_for_products(driver)
+            self.telemetry.observe("dom_bytes", driver.execute_script(DOM_SIZE))
+            manufacturers = self.cached_manufacturers(stored_key) if not prices_only else []
+            cached = manufacturers is not None
+            if not cached:
+                manufacturers = self.read_manufacturers(driver, stored_key)
+            total_page_number = get_number_of_pages(driver)
+            if key is not None:
+                self.page_counts[key] = total_page_number
+            pages = checkpoint.start(key, manufacturers, total_page_number) if checkpoint is not None else {}
+
+            archive = self.archive if stored_key is not None else None
+            digests: Dict[int, str] = {}
+            if archive is not None and checkpoint is not None:
+                self.archive_resumed(key, pages, digests)
+
+            def record(page: int, rows: list, html: Optional[str] = None) -> None:
+                pages[page] = rows
+                self.telemetry.increment("pages_total")
+                if archive is not None and html is not None:
+                    digests[page] = archive.put(html)
+                    archive.record_page(key, page, digests[page])
+                if checkpoint is not None:
+                    checkpoint.save_page(key, page, rows, digests.get(page))
+
+            if 1 not in pages:
+                record(1, self.extract(driver, cells), self.table_html(driver, cells))
+            page_numbers = set(range(2, total_page_number + 1)) - pages.keys()
+            if page_numbers and self.fingerprints is not None and stored_key is not None:
+                self.reuse_unchanged(pooled, url, key, total_page_number, pages, page_numbers, record, digests)
+            self.fetch_pages(pooled, url, page_numbers, record, cells)
+            if cached and not prices_only and not all(resolves(row[0], manufacturers)
+                                                      for rows in pages.values() for row in rows):
+                # A brand that is missing from the list means the cached list is out of date
+                manufacturers = self.read_manufacturers(driver, stored_key)
+                if checkpoint is not None:
+                    checkpoint.start(key, manufacturers, total_page_number)
+        if archive is not None:
+            archive.record_listing(key, manufacturers, total_page_number)
+        if self.fingerprints is not None and stored_key is not None:
+            self.fingerprints.save(key, manufacturers, pages, digests)
+        if self.recorder is not None and stored_key is not None:
+            self.recorder.save(key, url, manufacturers, pages)
+        return manufacturers, merge_pages(pages)
+
+    def cached_manufacturers(self, key: Optional[PageKey]) -> Optional[List[str]]:
+        if self.manufacturer_cache is None or key is None:
+            return None
+        return self.manufacturer_cache.get(*key)
+
+    def read_manufacturers(self, driver, key: Optional[PageKey]) -> List[str]:
+        with self.telemetry.timer("manufacturers_seconds"):
+            manufacturers = get_manufacturers(driver)
+        if self.manufacturer_cache is not None and key is not None:
+            self.manufacturer_cache.set(key[0], key[1], manufacturers, key[2])
+        return manufacturers
+
+    def archive_resumed(self, key: PageKey, pages: Dict[int, list], digests: Dict[int, str]) -> None:
+        # Resumed pages were archived by the run that scraped them, this run's manifest points at the same html
+        stored = self.checkpoint.stored_digests(key)
+        for page in pages:
+            if page in stored:
+                digests[page] = stored[page]
+                self.archive.record_page(key, page, stored[page])
 
-    def get_part_data_for_url(self, url: str) -> tuple:
-        driver = self.get_driver()
-        driver.get(url)
-        manufacturers = get_manufacturers(driver)
-        total_page_number = get_number_of_pages(driver)
-        products = find_products(driver.page_source)
+    def reuse_unchanged(self, pooled, url: str, key: PageKey, page_count: int, pages: Dict[int, list],
+                        page_numbers: set, record: Callable[..., None], digests: Dict[int, str]) -> None:
+        """
+        Takes the remaining pages of a listing from its last complete scrape if the listing still has as many pages,
+        and the pages scraped so far plus `confirm_pages` more are identical to the ones stored for it.
+        """
 
-        if total_page_number == 1:
-            driver.quit()
-            return manufacturers, products
-        else:
-            page_numbers = set((x for x in range(2, total_page_number + 1)))
-        previous_products = set(products)
+        stored = self.fingerprints.get(key)
+        if not matches_stored(stored, page_count, pages):
+            return
+        self.fetch_pages(pooled, url, set(sorted(page_numbers)[:self.confirm_pages]), record, PRODUCT_CELLS)
+        page_numbers -= pages.keys()
+        if not matches_stored(stored, page_count, pages):
+            return
+        for page in page_numbers:
+            pages[page] = stored["pages"][page]
+            digest = stored.get("digests", {}).get(page)
+            if self.archive is not None and digest is not None:
+                # The archive already holds the html of the page from the scrape that is being reused
+                digests[page] = digest
+                self.archive.record_page(key, page, digest)
+            if self.checkpoint is not None:
+                self.checkpoint.save_page(key, page, pages[page], digests.get(page))
+        self.telemetry.increment("pages_reused_total", len(page_numbers))
+        page_numbers.clear()
+
+    def fetch_pages(self, pooled, url: str, page_numbers: set, record: Callable[..., None],
+                    cells: str = PRODUCT_CELLS) -> None:
+        if page_numbers and self.harvest:
+            # Collect every remaining page from inside the browser session, and only fall back to
+            # navigating page by page for whatever the harvester could not collect
+            self.harvest_remaining(pooled, url, page_numbers, record, cells)
+        if page_numbers:
+            self.visit_pages(pooled, url, page_numbers, record, cells)
+
+    def harvest_remaining(self, pooled, url: str, page_numbers: set, record: Callable[..., None],
+                          cells: str = PRODUCT_CELLS) -> None:
+        pages = sorted(page_numbers)
+        for i in range(0, len(pages), self.harvest_chunk):
+            chunk = pages[i:i + self.harvest_chunk]
+            self.wait_for_turn(url, len(chunk))
+            with self.telemetry.timer("harvest_seconds"):
+                fragments = {} if self.archive is not None and cells == PRODUCT_CELLS else None
+                harvested = harvest_pages(pooled.driver, chunk, telemetry=self.telemetry, cells=cells,
+                                          fragments=fragments)
+            pooled.pages += len(harvested)
+            for page, rows in harvested.items():
+                record(page, rows, fragments.get(page) if fragments is not None else None)
+                page_numbers.discard(page)
+            if len(harvested) < len(chunk):
+                return
+
+    def visit_pages(self, pooled, url: str, page_numbers: set, record: Callable[..., None],
+                    cells: str = PRODUCT_CELLS) -> None:
+        driver = pooled.driver
+        signature = product_table_signature(driver)
         while len(page_numbers) > 0:
             new_page_num = random.sample(page_numbers, 1)[0]
             page_numbers.remove(new_page_num)
             new_url = generate_page_url_from_base(url, new_page_num)
-            driver.get(new_url)
-            start_refresh = time.perf_counter()
-            while time.perf_counter() - start_refresh < 30:
-                new_products = find_products(driver.page_source)
-                if set(new_products) == previous_products:
-                    time.sleep(3)
+
+            def load() -> str:
+                self.wait_for_turn(new_url)
+                if driver.current_url == new_url:
+                    # Navigating to the hash we are already on does not fire a page change, so a retry reloads
+                    with self.telemetry.timer("driver_get_seconds"):
+                        driver.refresh()
+                    pooled.pages += 1
                 else:
-                    products.extend(new_products)
-                    previous_products = set(new_products)
-                    break
-            else:
-                raise TimeoutException
-        driver.quit()
-        product_set = list(set(products))
-        return manufacturers, product_set
-
-    def get_driver(self):
+                    with self.telemetry.timer("driver_get_seconds"):
+                        pooled.get(new_url)
+                with self.telemetry.timer("wait_seconds"):
+                    return wait_for_product_change(driver, signature)
+
+            signature = retry(load, attempts=self.page_attempts, exceptions=(WebDriverException,),
+                              on_retry=self.record_retry)
+            record(new_page_num, self.extract(driver, cells), self.table_html(driver, cells))
+
+    def extract(self, driver, cells: str = PRODUCT_CELLS) -> List[tuple]:
+        with self.telemetry.timer("extract_seconds"):
+            return extract_products(driver, telemetry=self.telemetry, cells=cells)
+
+    def table_html(self, driver, cells: str = PRODUCT_CELLS) -> Optional[str]:
+        # Only pages that are read in full are archived
+        if self.archive is None or cells != PRODUCT_CELLS:
+            return None
+        return driver.execute_script(TABLE_FRAGMENT)
+
+    def record_retry(self, error: BaseException, delay: float) -> None:
+        self.telemetry.increment("retries_total")
+        self.telemetry.observe("backoff_seconds", delay)
+
+    def wait_for_turn(self, url: str, pages: int = 1) -> None:
+        if self.throttle is not None:
+            with self.telemetry.timer("throttle_seconds"):
+                self.throttle(url, pages)
+
+    def open_tab(self):
+        with self.controller_lock:
+            if self.controller is None or not self.controller.is_alive():
+                if self.controller is not None:
+                    self.controller.quit()
+                self.controller = TabController(self.get_driver(page_load_strategy="none"))
+            controller = self.controller
+        tab = controller.open_tab()
+        if self.blocking is not None:
+            # URL blocking is installed per target, so every new tab needs its own copy
+            self.blocking.apply_to_driver(tab)
+        return tab
+
+    def get_driver(self, page_load_strategy: str = "normal"):
         options = webdriver.ChromeOptions()
         options.add_argument("--headless")
         options.add_argument("--start-maximized")
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--incognito')
-        driver = webdriver.Chrome(options=options, executable_path=self.executable_path)
+        if self.blocking is not None:
+            self.blocking.apply_to_options(options)
+        capabilities = DesiredCapabilities.CHROME.copy()
+        capabilities["pageLoadStrategy"] = page_load_strategy
+        driver = webdriver.Chrome(options=options, desired_capabilities=capabilities,
+                                  executable_path=self.executable_path)
+        if self.blocking is not None:
+            self.blocking.apply_to_driver(driver)
         driver.set_script_timeout(300)
-        driver.implicitly_wait(10)
+        # A tabbed browser must never block inside a command, so it relies on explicit waits only
+        driver.implicitly_wait(0 if page_load_strategy == "none" else 10)
         return driver
 
 
-def get_manufacturers(driver: webdriver.Chrome) -> List[str]:
-    html = lxml.html.fromstring(driver.page_source)
-    try:
-        show_more = WebDriverWait(driver, 10).until(lambda x: x.find_element_by_xpath('//*[@id="m_set"]/a[1]'))
-        center_element(driver, show_more)
-        click(driver, show_more)
-    except TimeoutException:
-        pass
-    manufacturers = html.xpath('//*[@id="m_set"]/li[contains(@id, "li_")]/label/text()')
-    return manufacturers
+def extract_products(driver, telemetry: Optional[Telemetry] = None, cells: str = PRODUCT_CELLS) -> List[tuple]:
+    """
+    Function that reads the product rows of the current page inside the browser. The rows have the same shape as
+    the ones produced by parser.find_products, without shipping the whole page_source over the WebDriver.
+
+    :param driver: The driver that has a product list loaded.
+    :param telemetry: Optional[Telemetry]: Records the size of the payload, if given.
+    :param cells: str: XPath of the cells to read from every product row.
+    :return: List[tuple]: The raw product rows.
+    """
 
+    payload = driver.execute_script(PRODUCTS, cells)
+    if telemetry is not None:
+        telemetry.observe("transfer_bytes", len(payload))
+    return [tuple(row) for row in json.loads(payload)]
 
-def center_element(driver, element) -> None:
-    driver.execute_script("""arguments[0].scrollIntoView({
-                behavior: 'auto',
-                block: 'center',
-                inline: 'center'
-            });""", element)
 
+def get_manufacturers(driver) -> List[str]:
+    """
+    Function that reads the manufacturer filter list of the loaded listing. Every label is in the DOM whether or not
+    the list has been expanded, so there is no need to wait for and click its "show more" link.
+    """
 
-def click(driver, element) -> None:
-    driver.execute_script("""arguments[0].click();""", element)
+    return json.loads(driver.execute_script(MANUFACTURERS))
+
+
+def product_table_signature(driver) -> Optional[str]:
+    return driver.execute_script(TABLE_SIGNATURE + "return pcppSignature();")
+
+
+def wait_for_product_change(driver, previous_signature: Optional[str], timeout: float = 30) -> str:
+    """
+    Function that blocks until the product table no longer starts with the row it started with before
+    a pagination change. Raises a TimeoutException if the table is not replaced in time.
+
+    :param driver: The driver that is switching pages.
+    :param previous_signature: Optional[str]: The signature of the table before the page was changed.
+    :param timeout: float: How many seconds to wait for the new rows.
+    :return: str: The signature of the new product table.
+    """
+
+    def replaced(x) -> Optional[str]:
+        signature = product_table_signature(x)
+        if signature is not None and signature != previous_signature:
+            return signature
+
+    return WebDriverWait(driver, timeout, poll_frequency=0.1).until(replaced)
+
+
+def harvest_pages(driver, pages: List[int], timeout: float = 30, telemetry: Optional[Telemetry] = None,
+                  cells: str = PRODUCT_CELLS, fragments: Optional[Dict[int, str]] = None) -> Dict[int, list]:
+    """
+    Function that walks the client-side pagination of the loaded product list from an injected script and
+    returns the rows of every page it managed to collect as a single JSON payload.
+
+    :param driver: The driver that has the first page of the product list loaded.
+    :param pages: List[int]: The page numbers to collect.
+    :param timeout: float: How many seconds to wait for each page to render.
+    :param telemetry: Optional[Telemetry]: Records the size of the payload, if given.
+    :param cells: str: XPath of the cells to read from every product row.
+    :param fragments: Optional[Dict[int, str]]: Filled with the html of the product table of every page, if given.
+    :return: Dict[int, list]: The product rows of every collected page, keyed by page number.
+    """
+
+    try:
+        driver.execute_script(START_HARVEST, pages, int(timeout * 1000), cells, fragments is not None)
+        WebDriverWait(driver, timeout * len(pages) + 10, poll_frequency=0.25).until(
+            lambda x: x.execute_script(HARVEST_DONE))
+        payload = driver.execute_script(HARVEST_RESULT)
+        state = json.loads(payload)
+    except WebDriverException as e:
+        logger.warning(f"Harvesting pages failed, falling back to page navigation: {e}")
+        return {}
+    if telemetry is not None:
+        telemetry.observe("transfer_bytes", len(payload))
+    if state["error"]:
+        logger.warning(f"Harvesting pages stopped early, falling back to page navigation: {state['error']}")
+    if fragments is not None:
+        fragments.update({int(page): html for page, html in state["html"].items()})
+    return {int(page): [tuple(row) for row in rows] for page, rows in state["pages"].items()}
+
+
+def wait_for_products(driver, timeout: float = 30) -> str:
+    return WebDriverWait(driver, timeout, poll_frequency=0.1).until(product_table_signature)
 
 
 def get_number_of_pages(driver) -> int:
-    page_list = WebDriverWait(driver, 10).until(
-        lambda x: x.find_elements_by_xpath('//*[@id="module-pagination"]/ul/li/a'))
-    last_button = page_list[-1]
-    return int(last_button.text)
+    page_list = WebDriverWait(driver, 10).until(lambda x: x.execute_script(PAGE_NUMBERS))
+    return int(page_list[-1])
+
+
+def merge_listings(part: str, listings: Dict[Optional[str], tuple]) -> tuple:
+    """
+    Function that merges the scraped listings of a part into a single (manufacturers, products) result.
+
+    :param part: str: The part type.
+    :param listings: Dict[Optional[str], tuple]: The (manufacturers, products) of every listing, keyed by ECC filter.
+    :return: tuple: The manufacturers and products of the part.
+    """
+
+    # For memory parts we want to add property that isn't readily available from the data-set:
+    # The type of ECC support the memory module has
+    # For this purpose, we query the memory URL 4 times, once per each ECC option on the search page
+    # Every time we complete reading a result set, we will merge it to a global/total list of memory modules, not before
+    # we populate a "fake" property indicating what ECC support the module has:
+    if part == "memory":
+        total_manufacturers_set = set()
+        total_product_set = set()
+
+        for ecc_type, (manufacturers, product_set) in listings.items():
+            # This will merge the manufacturer list from the per-ECC query back to the final
+            # list of manufacturers
+            total_manufacturers_set = total_manufacturers_set | set(manufacturers)
+            # Before we merge the per-ECC product list back with the global list,
+            # We have to add the ecc_type back to the tuple so that it would "appear" as if the scraped data
+            # had the ecc information embedded in it organically
+            product_set = set(map(lambda t: t[:-1] + (ecc_type,) + t[-1:], product_set))
+            # Merge the product list
+            total_product_set = total_product_set | set(product_set)
+
+        # Finally, we return the memory manufacturer+product list as if they were
+        # all generated from a single scraping session
+        return list(total_manufacturers_set), list(total_product_set)
+    return listings[None]
+
+
+def merge_pages(pages: Dict[int, list]) -> list:
+    return list(set(itertools.chain.from_iterable(pages.values())))
 
 
 def get_rand_float(amount: int) -> float:
     return random.uniform(amount, amount + 1)
 
 
-def base_url(region: str):
+def base_url(region: str, root: Optional[str] = None):
+    if root is not None:
+        return f"{root}/{region}/products"
     if not region == "us":
         return f"https://{region}.pcpartpicker.com/products"
     return "https://pcpartpicker.com/products"
 
 
-def generate_part_url(region: str, part: str) -> str:
-    return f"{base_url(region)}/{part}/"
+def generate_part_url(region: str, part: str, root: Optional[str] = None) -> str:
+    return f"{base_url(region, root)}/{part}/"
+
+
+def generate_part_urls(region: str, part: str, root: Optional[str] = None) -> Dict[Optional[str], str]:
+    """
+    Function that returns every listing URL that has to be scraped for a part, keyed by the ECC filter it applies.
+    Parts other than memory have a single, unfiltered listing keyed by None. A root such as the address of a replay
+    server replaces pcpartpicker.com.
+    """
+
+    base_url = generate_part_url(region, part, root)
+    if part == "memory":
+        return {
+            "Non-ECC / Unbuffered": base_url + "#E=0",
+            "Non-ECC / Registered": base_url + "#E=10",
+            "ECC / Unbuffered": base_url + "#E=1",
+            "ECC / Registered": base_url + "#E=11",
+        }
+    return {None: base_url}
 
 
 def generate_page_url_from_base(url: str, page_number: int):
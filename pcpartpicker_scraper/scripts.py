@@ -0,0 +1,130 @@
+"""JavaScript snippets that are injected into product list pages through the WebDriver."""
+
+# Mirrors parser.find_products/parse_elements so that rows read in the browser have the same shape as rows
+# parsed from page_source with lxml.
+PRODUCT_CELLS = './/*[@class="td__name"]/a/div[@class="td__nameWrapper"]/p | .//*[contains(@class, "td__spec")] | ' \
+                './/*[@class="td__price"]'
+
+# Only the name and price of every product, for refreshing the prices of products whose specs are already known.
+PRICE_CELLS = './/*[@class="td__name"]/a/div[@class="td__nameWrapper"]/p | .//*[@class="td__price"]'
+
+PRODUCT_ROWS = """
+function pcppRows(cellPath) {
+    var products = document.evaluate('//*[@class="tr__product"]', document, null,
+                                     XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var result = [];
+    for (var i = 0; i < products.snapshotLength; i++) {
+        var cells = document.evaluate(cellPath, products.snapshotItem(i), null,
+                                      XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var row = [];
+        for (var j = 0; j < cells.snapshotLength; j++) {
+            var text = [];
+            var children = cells.snapshotItem(j).childNodes;
+            for (var k = 0; k < children.length; k++) {
+                if (children[k].nodeType === Node.TEXT_NODE || children[k].nodeType === Node.CDATA_SECTION_NODE) {
+                    text.push(children[k].nodeValue);
+                }
+            }
+            row.push(text.length ? text.join(' ') : null);
+        }
+        result.push(row);
+    }
+    return result;
+}
+"""
+
+# The product rows of the page as an html fragment that parser.find_products can read, for the page archive.
+TABLE_HTML = """
+function pcppTableHtml() {
+    var products = document.evaluate('//*[@class="tr__product"]', document, null,
+                                     XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var html = [];
+    for (var i = 0; i < products.snapshotLength; i++) {
+        html.push(products.snapshotItem(i).outerHTML);
+    }
+    return '<table><tbody>' + html.join('') + '</tbody></table>';
+}
+"""
+
+TABLE_SIGNATURE = """
+function pcppSignature() {
+    var row = document.evaluate('//*[@class="tr__product"]', document, null,
+                                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return row ? row.textContent : null;
+}
+"""
+
+# Steps through the client-side pagination of the current product list without leaving the page.
+# The harvest runs in the background and records its progress on window.__pcppHarvest, so the driver is
+# free to poll it with short commands instead of blocking on a single long-running async script.
+HARVEST = """
+var pages = arguments[0];
+var timeout = arguments[1];
+var cellPath = arguments[2];
+var withHtml = arguments[3];
+var state = window.__pcppHarvest = {done: false, error: null, pages: {}, html: {}};
+var base = window.location.hash.replace(/^#/, '').replace(/(^|&)page=\\d+/, '');
+
+function pageHash(page) {
+    return base ? base + '&page=' + page : 'page=' + page;
+}
+
+function step(i, previous) {
+    if (i >= pages.length) {
+        state.done = true;
+        return;
+    }
+    var page = pages[i];
+    var started = Date.now();
+    window.location.hash = pageHash(page);
+    (function poll() {
+        var current = pcppSignature();
+        if (current !== null && current !== previous) {
+            state.pages[page] = pcppRows(cellPath);
+            if (withHtml) {
+                state.html[page] = pcppTableHtml();
+            }
+            step(i + 1, current);
+        } else if (Date.now() - started > timeout) {
+            state.error = 'Timed out waiting for page ' + page;
+            state.done = true;
+        } else {
+            setTimeout(poll, 50);
+        }
+    })();
+}
+
+step(0, pcppSignature());
+"""
+
+START_HARVEST = PRODUCT_ROWS + TABLE_SIGNATURE + TABLE_HTML + HARVEST
+
+HARVEST_DONE = "return window.__pcppHarvest !== undefined && window.__pcppHarvest.done;"
+
+HARVEST_RESULT = "return JSON.stringify(window.__pcppHarvest);"
+
+TABLE_FRAGMENT = TABLE_HTML + "return pcppTableHtml();"
+
+PRODUCTS = PRODUCT_ROWS + "return JSON.stringify(pcppRows(arguments[0]));"
+
+MANUFACTURERS = """
+var labels = document.evaluate('//*[@id="m_set"]/li[contains(@id, "li_")]/label/text()', document, null,
+                               XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var result = [];
+for (var i = 0; i < labels.snapshotLength; i++) {
+    result.push(labels.snapshotItem(i).nodeValue);
+}
+return JSON.stringify(result);
+"""
+
+PAGE_NUMBERS = """
+var links = document.evaluate('//*[@id="module-pagination"]/ul/li/a', document, null,
+                              XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var result = [];
+for (var i = 0; i < links.snapshotLength; i++) {
+    result.push(links.snapshotItem(i).textContent.trim());
+}
+return result;
+"""
+
+DOM_SIZE = "return document.documentElement.outerHTML.length;"
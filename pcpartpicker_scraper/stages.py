@@ -0,0 +1,114 @@
+import ast
+import functools
+import hashlib
+import importlib
+import inspect
+import textwrap
+import types
+from typing import Iterable
+
+from .brands import brands
+from .mappings import byte_classes, clockspeeds, currency_classes, currency_symbols, none_symbols, part_classes
+from .parse_utils import part_funcs
+from .parser import Parser
+from .scraper import generate_part_urls, merge_listings, merge_pages
+from .scripts import HARVEST, MANUFACTURERS, PAGE_NUMBERS, PRODUCT_CELLS, PRODUCT_ROWS, PRODUCTS, TABLE_SIGNATURE
+
+# The package sets its __name__ to a list, so its modules are looked up through __package__ instead
+parse_utils, parts, serialization, utils = (importlib.import_module("." + name, __package__) for name in
+                                             ("parse_utils", "parts", "serialization", "utils"))
+
+
+def normalized_source(item: object) -> str:
+    """
+    Function that returns the syntax tree of a module, class or function as text, without its comments, docstrings
+    or formatting, so that only changes to what the code does change its digest.
+    """
+
+    tree = ast.parse(textwrap.dedent(inspect.getsource(item)))
+    for node in ast.walk(tree):
+        # get_docstring recognizes docstrings whether they parse as ast.Str or as ast.Constant
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) \
+                and ast.get_docstring(node, clean=False) is not None:
+            node.body = node.body[1:] or [ast.Pass()]
+    return ast.dump(tree)
+
+
+def code_digest(objects: Iterable[object]) -> str:
+    """
+    Function that hashes the normalized source of every module, class and function given, and the repr of every
+    other value, so that the digest changes whenever any of the code or configuration it covers does.
+    """
+
+    digest = hashlib.sha256()
+    for item in objects:
+        if isinstance(item, (types.ModuleType, type, types.FunctionType)):
+            try:
+                text = normalized_source(item)
+            except (OSError, TypeError):
+                # Builtins such as int have no source, their name stands in for it
+                text = repr(item)
+        elif isinstance(item, (set, frozenset)):
+            text = repr(sorted(item, key=repr))
+        else:
+            text = repr(item)
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def parse_helpers() -> list:
+    # Functions of parse_utils that no part uses directly are helpers that any of them may call
+    used = {func for funcs in part_funcs.values() for func in funcs}
+    return [func for name, func in sorted(vars(parse_utils).items())
+            if inspect.isfunction(func) and func.__module__ == parse_utils.__name__ and func not in used]
+
+
+def value_classes() -> list:
+    # The dataclasses that part fields are made of, such as Bytes and ClockSpeed, are shared by every part
+    return [cls for name, cls in sorted(vars(parts).items())
+            if inspect.isclass(cls) and cls.__module__ == parts.__name__ and cls not in part_classes.values()]
+
+
+@functools.lru_cache(maxsize=None)
+def scrape_digest(part: str) -> str:
+    """
+    Function that returns the digest of the code that turns the listings of a part into raw rows. Raw rows stored
+    under a different digest were read by code that has changed since. Only the scripts whose output ends up in the
+    rows are included, since any change here makes the whole catalog stale.
+    """
+
+    return code_digest([part, PRODUCT_CELLS, PRODUCT_ROWS, PRODUCTS, TABLE_SIGNATURE, HARVEST, MANUFACTURERS,
+                        PAGE_NUMBERS, merge_listings, merge_pages, generate_part_urls])
+
+
+def publish_digest(region: str, part: str, config: Iterable[object] = ()) -> str:
+    """
+    Function that returns the digest of the code and configuration that turn the raw rows of a part/region combo
+    into its published file. Only the parse functions and the dataclass of the part itself are included, so a change
+    to one of them only invalidates the parts that use it.
+
+    :param region: str: The region.
+    :param part: str: The part type.
+    :param config: Iterable[object]: Any further configuration the output depends on, such as the html template.
+    :return: str: The digest.
+    """
+
+    return code_digest([region, part_code_digest(part), currency_symbols[region], currency_classes[region].code]
+                       + list(config))
+
+
+@functools.lru_cache(maxsize=None)
+def shared_code_digest() -> str:
+    # Parsing the source of the code every part shares is slow, and it cannot change while the process runs
+    return code_digest([Parser, none_symbols, sorted(byte_classes), sorted(clockspeeds), brands, utils, serialization]
+                       + parse_helpers() + value_classes())
+
+
+@functools.lru_cache(maxsize=None)
+def part_code_digest(part: str) -> str:
+    funcs = []
+    for func in part_funcs[part]:
+        if func not in funcs:
+            funcs.append(func)
+    return code_digest([part, shared_code_digest(), part_classes[part]] + funcs)
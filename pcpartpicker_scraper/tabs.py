@@ -0,0 +1,86 @@
+import threading
+from typing import Set
+
+from selenium import webdriver
+
+
+class TabController:
+    """TabController:
+
+    This class owns a single browser and lets many scrape tasks share it, each through its own tab. Every tab lives
+    in a separate browser context so cookies and storage stay isolated, and WebDriver commands from all tabs are
+    serialized through one lock because a WebDriver session can only talk to one window at a time.
+    """
+
+    def __init__(self, driver: webdriver.Chrome) -> None:
+        self.driver = driver
+        self.lock = threading.RLock()
+        self.home = driver.current_window_handle
+        self.current = self.home
+        self.contexts = {}
+
+    def open_tab(self) -> "Tab":
+        with self.lock:
+            handles: Set[str] = set(self.driver.window_handles)
+            context = self.driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            self.driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank", "browserContextId": context})
+            handle = (set(self.driver.window_handles) - handles).pop()
+            self.contexts[handle] = context
+            return Tab(self, handle)
+
+    def close_tab(self, handle: str) -> None:
+        with self.lock:
+            self.switch(handle)
+            self.driver.close()
+            self.switch(self.home)
+            context = self.contexts.pop(handle, None)
+            if context is not None:
+                self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context})
+
+    def switch(self, handle: str) -> None:
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def is_alive(self) -> bool:
+        try:
+            with self.lock:
+                return self.home in self.driver.window_handles
+        except Exception:
+            return False
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class Tab:
+    """Tab:
+
+    Stands in for a driver. Every attribute access switches the shared browser to this tab first, while holding the
+    controller's lock, so scraper code written against a whole driver works unchanged. Waits are left to the caller's
+    WebDriverWait polling, which releases the lock between polls and lets the other tabs make progress.
+    """
+
+    def __init__(self, controller: TabController, handle: str) -> None:
+        self.controller = controller
+        self.handle = handle
+
+    def __getattr__(self, name: str):
+        with self.controller.lock:
+            self.controller.switch(self.handle)
+            attribute = getattr(self.controller.driver, name)
+        if not callable(attribute):
+            return attribute
+
+        def command(*args, **kwargs):
+            with self.controller.lock:
+                self.controller.switch(self.handle)
+                return attribute(*args, **kwargs)
+
+        return command
+
+    def quit(self) -> None:
+        self.controller.close_tab(self.handle)
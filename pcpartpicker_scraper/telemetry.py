@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+second_buckets: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+byte_buckets: Tuple[float, ...] = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7)
+
+Labels = Tuple[str, str]
+
+
+class Histogram:
+    """Histogram:
+
+    Cumulative histogram in the Prometheus sense, with a fixed set of upper bounds.
+    """
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        result = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return result
+
+
+class Telemetry:
+    """Telemetry:
+
+    This class collects timings, sizes and counts from a scrape, broken down by region and part. Every observation
+    is appended to a JSON lines file as it happens, and the aggregated histograms and counters can be written out as
+    a Prometheus text-format snapshot. Without a path, observations are only kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, prefix: str = "pcpartpicker") -> None:
+        self.path = path
+        self.prefix = prefix
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self._context = threading.local()
+        self._lock = threading.Lock()
+        self._file = open(path, "a") if path is not None else None
+
+    @contextmanager
+    def labels(self, region: str, part: str) -> Iterator[None]:
+        """
+        Context manager that attributes every observation made by the current thread to a region and part.
+        """
+
+        previous = getattr(self._context, "labels", None)
+        self._context.labels = (region, part)
+        try:
+            yield
+        finally:
+            self._context.labels = previous
+
+    @property
+    def current_labels(self) -> Labels:
+        return getattr(self._context, "labels", None) or ("", "")
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name: str, value: float) -> None:
+        labels = self.current_labels
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                bounds = byte_buckets if name.endswith("_bytes") else second_buckets
+                histogram = self.histograms[(name, labels)] = Histogram(bounds)
+            histogram.observe(value)
+            self._emit(name, value, labels)
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        labels = self.current_labels
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+            self._emit(name, amount, labels)
+
+    def prometheus(self) -> str:
+        """
+        Returns every histogram and counter in the Prometheus text exposition format.
+        """
+
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.histograms}):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (histogram_name, labels), histogram in sorted(self.histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    label_string = _label_string(labels)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{{label_string},le="{bound}"}} {count}')
+                    lines.append(f"{metric}_sum{{{label_string}}} {histogram.sum:g}")
+                    lines.append(f"{metric}_count{{{label_string}}} {histogram.count}")
+            for name in sorted({name for name, _ in self.counters}):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for (counter_name, labels), value in sorted(self.counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{metric}{{{_label_string(labels)}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w") as file:
+            file.write(self.prometheus())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _emit(self, name: str, value: float, labels: Labels) -> None:
+        if self._file is None:
+            return
+        event = {"time": time.time(), "metric": name, "value": value, "region": labels[0], "part": labels[1]}
+        self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+
+
+def _label_string(labels: Labels) -> str:
+    return f'region="{labels[0]}",part="{labels[1]}"'
@@ -0,0 +1,207 @@
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .history import Job
+
+schema = """
+CREATE TABLE IF NOT EXISTS jobs (
+    part TEXT NOT NULL,
+    region TEXT NOT NULL,
+    ecc_type TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result BLOB,
+    error TEXT,
+    PRIMARY KEY (part, region, ecc_type)
+)
+"""
+
+
+class WorkQueue:
+    """WorkQueue:
+
+    This class is a SQLite backed queue of listing jobs that many scrape workers, on one or several machines, can pull
+    from. A worker leases a job for `lease_seconds` and must keep renewing the lease with heartbeats. A job whose lease
+    runs out is handed to the next worker that asks, so a worker that dies never strands its job.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300.0, max_attempts: int = 3) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        with self._transaction() as connection:
+            connection.execute(schema)
+
+    def enqueue(self, jobs: Iterable[Job], priorities: Optional[Callable[[Job], float]] = None) -> None:
+        """
+        Adds jobs to the queue. Jobs that already ran to completion or failed in an earlier run are queued again,
+        including finished jobs whose combo was never collected because a sibling listing failed, so that old results
+        are never merged with new ones. Jobs that are still pending or leased are left alone. Jobs with a higher
+        priority are leased first.
+        """
+
+        rows = [_key(job) + (priorities(job) if priorities is not None else 0,) for job in jobs]
+        with self._transaction() as connection:
+            connection.executemany(
+                "UPDATE jobs SET state = 'pending', owner = NULL, lease_expires = NULL, attempts = 0, result = NULL, "
+                "error = NULL, priority = ? WHERE part = ? AND region = ? AND ecc_type = ? "
+                "AND state IN ('done', 'collected', 'failed')", [row[3:] + row[:3] for row in rows])
+            connection.executemany(
+                "INSERT OR IGNORE INTO jobs (part, region, ecc_type, priority) VALUES (?, ?, ?, ?)", rows)
+
+    def lease(self, owner: str) -> Optional[Job]:
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT part, region, ecc_type FROM jobs "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY priority DESC LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE part = ? AND region = ? AND ecc_type = ?", (owner, now + self.lease_seconds) + row)
+        return _job(row)
+
+    def heartbeat(self, job: Job, owner: str) -> bool:
+        """
+        Renews the lease on a job. Returns False if the lease was lost to another worker.
+        """
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE part = ? AND region = ? AND ecc_type = ? AND state = 'leased' AND owner = ?",
+                (time.time() + self.lease_seconds,) + _key(job) + (owner,))
+            return cursor.rowcount > 0
+
+    def complete(self, job: Job, owner: str, result) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL "
+                "WHERE part = ? AND region = ? AND ecc_type = ? AND owner = ? AND state = 'leased'",
+                (pickle.dumps(result),) + _key(job) + (owner,))
+
+    def fail(self, job: Job, owner: str, error: str) -> None:
+        """
+        Hands a job back after a failed attempt. It is retried until it has been attempted `max_attempts` times.
+        """
+
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE part = ? AND region = ? AND ecc_type = ? AND owner = ? AND state = 'leased'",
+                (self.max_attempts, error) + _key(job) + (owner,))
+
+    def results(self, state: str = "done") -> Iterator[Tuple[Job, object]]:
+        for row in self._connection().execute(
+                "SELECT part, region, ecc_type, result, error FROM jobs WHERE state = ?", (state,)):
+            yield _job(row[:3]), pickle.loads(row[3]) if row[3] is not None else row[4]
+
+    def collect(self, part: str, region: str) -> None:
+        """
+        Marks the finished jobs of a part/region combo as collected once their results have been stored.
+        """
+
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET state = 'collected', result = NULL "
+                               "WHERE part = ? AND region = ? AND state = 'done'", (part, region))
+
+    def counts(self) -> dict:
+        return dict(self._connection().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def is_finished(self) -> bool:
+        counts = self.counts()
+        return not counts.get("pending") and not counts.get("leased")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+
+class _Transaction:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+def _key(job: Job) -> Tuple[str, str, str]:
+    return job[0], job[1], job[2] or ""
+
+
+def _job(row) -> Job:
+    return row[0], row[1], row[2] or None
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def run_worker(queue: WorkQueue, scrape: Callable[[str, str, Optional[str]], tuple], owner: Optional[str] = None,
+               poll_interval: float = 5.0, on_complete: Optional[Callable[[Job], None]] = None) -> List[Job]:
+    """
+    Function that leases and scrapes jobs until the queue has nothing left to hand out, renewing each lease from a
+    background thread while its job runs.
+
+    :param queue: WorkQueue: The shared queue.
+    :param scrape: Callable[[str, str, Optional[str]], tuple]: Scrapes a (part, region, ECC filter) listing.
+    :param owner: Optional[str]: A name for this worker that is unique across machines.
+    :param poll_interval: float: Seconds to wait before asking again while other workers hold every remaining job.
+    :param on_complete: Optional[Callable[[Job], None]]: Called with every job once its result is in the queue.
+    :return: List[Job]: The jobs this worker completed.
+    """
+
+    owner = owner or default_owner()
+    completed = []
+    while True:
+        job = queue.lease(owner)
+        if job is None:
+            if queue.is_finished():
+                return completed
+            time.sleep(poll_interval)
+            continue
+
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(queue.lease_seconds / 3):
+                if not queue.heartbeat(job, owner):
+                    return
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        try:
+            result = scrape(*job)
+        except Exception as e:
+            queue.fail(job, owner, f"{type(e).__name__}: {e}")
+        else:
+            queue.complete(job, owner, result)
+            completed.append(job)
+            if on_complete is not None:
+                on_complete(job)
+        finally:
+            stop.set()
+            heartbeat.join()
@@ -3,7 +3,7 @@
 set -e
 
 cd /home/jonathan/repos/pcpartpicker-scraper
-venv/bin/python main.py --parallel=2
+venv/bin/python main.py --autoscale --min-parallel=1 --max-parallel=8
 venv/bin/python -m pip install --upgrade pcpartpicker
 venv/bin/python -m pytest
 current_date_time="`date "+%Y-%m-%d %H:%M:%S"`";
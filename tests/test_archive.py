@@ -0,0 +1,37 @@
+from pcpartpicker_scraper.archive import PageArchive, extract_archived
+
+table = '<table><tbody><tr class="tr__product"><td class="td__name"><a><div class="td__nameWrapper">' \
+        '<p>AMD 2650</p></div></a></td><td class="td__spec td__spec--1">2</td>' \
+        '<td class="td__price">$59.61</td></tr></tbody></table>'
+
+
+def test_archive_round_trip(tmp_path):
+    archive = PageArchive(str(tmp_path), run="first")
+    digest = archive.put(table)
+    assert archive.put(table) == digest
+    assert archive.get(digest) == table
+
+    key = ("us", "cpu", None)
+    archive.record_page(key, 1, digest)
+    archive.record_listing(key, ["AMD"], 1)
+    assert archive.manifest() == {key: {"manufacturers": ["AMD"], "pages": 1, "digests": {1: digest}}}
+    assert extract_archived(str(tmp_path), digest) == [("AMD 2650", "2", "$59.61")]
+
+
+def test_latest_across_runs(tmp_path):
+    cpu, case = ("us", "cpu", None), ("us", "case", None)
+    first = PageArchive(str(tmp_path), run="1")
+    first.record_listing(cpu, ["AMD"], 1)
+    first.record_page(cpu, 1, "old")
+    first.record_listing(case, ["NZXT"], 1)
+    first.record_page(case, 1, "case")
+    second = PageArchive(str(tmp_path), run="2")
+    second.record_listing(cpu, ["AMD"], 1)
+    second.record_page(cpu, 1, "new")
+    third = PageArchive(str(tmp_path), run="3")
+    third.record_listing(case, ["NZXT"], 2)
+    third.record_page(case, 1, "incomplete")
+
+    latest = PageArchive(str(tmp_path)).latest()
+    assert latest[cpu]["digests"] == {1: "new"}
+    assert latest[case]["digests"] == {1: "case"}
@@ -0,0 +1,61 @@
+import sys
+
+import pytest
+
+from pcpartpicker_scraper.autoscale import Autoscaler
+
+mb = 1024 * 1024
+
+
+@pytest.fixture
+def system(monkeypatch):
+    readings = {"memory": 4000 * mb, "load": 0.1}
+    module = sys.modules[Autoscaler.__module__]
+    monkeypatch.setattr(module, "available_memory", lambda: readings["memory"])
+    monkeypatch.setattr(module, "cpu_load", lambda: readings["load"])
+    return readings
+
+
+def test_grows_one_step_with_headroom(system):
+    autoscaler = Autoscaler(minimum=1, maximum=4, memory_per_session=500 * mb)
+    autoscaler.record(latency=1.0)
+    assert autoscaler.target(2) == 3
+    assert autoscaler.target(4) == 4
+
+
+def test_shrinks_on_any_pressure(system):
+    autoscaler = Autoscaler(minimum=1, maximum=4, memory_per_session=500 * mb, max_latency=10.0)
+    system["memory"] = 400 * mb
+    assert autoscaler.target(3) == 2
+    system["memory"] = 4000 * mb
+    system["load"] = 0.9
+    assert autoscaler.target(3) == 2
+    system["load"] = 0.1
+    autoscaler.record(latency=15.0)
+    assert autoscaler.target(3) == 2
+    assert autoscaler.target(1) == 1
+
+
+def test_errors_shrink_and_the_middle_ground_holds(system):
+    autoscaler = Autoscaler(minimum=1, maximum=8, max_error_rate=0.2, window=10)
+    for _ in range(7):
+        autoscaler.record(latency=1.0)
+    for _ in range(3):
+        autoscaler.record(error=True)
+    assert autoscaler.error_rate() == pytest.approx(0.3)
+    assert autoscaler.target(4) == 3
+
+    # Errors age out of the window, and a rate between half the limit and the limit keeps the current size
+    for _ in range(8):
+        autoscaler.record(latency=1.0)
+    autoscaler.record(error=True)
+    autoscaler.record(error=True)
+    assert autoscaler.error_rate() == pytest.approx(0.2)
+    assert autoscaler.target(4) == 4
+    assert autoscaler.latency() == pytest.approx(1.0)
+
+
+def test_unknown_signals_do_not_block_growth(system):
+    system["memory"] = None
+    system["load"] = None
+    assert Autoscaler(minimum=2, maximum=3).target(1) == 2
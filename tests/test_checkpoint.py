@@ -0,0 +1,62 @@
+from pcpartpicker_scraper.checkpoint import PageCheckpoint
+
+
+def test_resume_missing_pages(tmp_path):
+    checkpoint = PageCheckpoint(str(tmp_path))
+    key = ("us", "cpu", None)
+    assert checkpoint.start(key, ["AMD"], 3) == {}
+    checkpoint.save_page(key, 1, [("AMD 2650", "$59.61")])
+    checkpoint.save_page(key, 3, [("AMD 5350", "$104.94")])
+    assert checkpoint.completed(key) is None
+
+    assert checkpoint.start(key, ["AMD"], 3) == {1: [("AMD 2650", "$59.61")], 3: [("AMD 5350", "$104.94")]}
+    checkpoint.save_page(key, 2, [("AMD 3650", "$70.00")])
+    manufacturers, pages = checkpoint.completed(key)
+    assert manufacturers == ["AMD"]
+    assert sorted(pages) == [1, 2, 3]
+
+
+def test_changed_page_count_drops_stored_pages(tmp_path):
+    checkpoint = PageCheckpoint(str(tmp_path))
+    key = ("us", "cpu", None)
+    checkpoint.start(key, ["AMD"], 2)
+    checkpoint.save_page(key, 1, [("AMD 2650", "$59.61")])
+    assert checkpoint.start(key, ["AMD"], 4) == {}
+    assert checkpoint.completed(key) is None
+
+
+def test_discard_drops_every_ecc_filter(tmp_path):
+    checkpoint = PageCheckpoint(str(tmp_path))
+    memory = [("us", "memory", "ECC / Registered"), ("us", "memory", "Non-ECC / Unbuffered")]
+    cpu = ("us", "cpu", None)
+    for key in memory + [cpu]:
+        checkpoint.start(key, [], 1)
+        checkpoint.save_page(key, 1, [])
+
+    checkpoint.discard("us", "memory")
+    assert all(checkpoint.completed(key) is None for key in memory)
+    assert checkpoint.completed(cpu) == ([], {1: []})
+
+
+def test_archive_digests_are_kept_with_pages(tmp_path):
+    checkpoint = PageCheckpoint(str(tmp_path))
+    key = ("us", "cpu", None)
+    checkpoint.start(key, ["AMD"], 2)
+    checkpoint.save_page(key, 1, [], "first")
+    checkpoint.save_page(key, 2, [])
+    assert checkpoint.stored_digests(key) == {1: "first"}
+    checkpoint.start(key, ["AMD"], 3)
+    assert checkpoint.stored_digests(key) == {}
+
+
+def test_discard_listing_keeps_other_ecc_filters(tmp_path):
+    checkpoint = PageCheckpoint(str(tmp_path))
+    registered, unbuffered = ("us", "memory", "ECC / Registered"), ("us", "memory", "ECC / Unbuffered")
+    for key in (registered, unbuffered):
+        checkpoint.start(key, [], 1)
+        checkpoint.save_page(key, 1, [], "digest")
+
+    checkpoint.discard_listing(registered)
+    assert checkpoint.completed(registered) is None
+    assert checkpoint.stored_digests(registered) == {}
+    assert checkpoint.completed(unbuffered) == ([], {1: []})
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from pcpartpicker_scraper.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.healthy = True
+        self.quit_called = False
+        self.window_handles = ["main"]
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("crashed")
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+
+def test_drivers_are_reused():
+    factory = FakeFactory()
+    pool = DriverPool(factory, max_drivers=2)
+    with pool.driver() as first:
+        first.get("https://pcpartpicker.com/")
+    with pool.driver() as second:
+        assert second is first
+    assert len(factory.drivers) == 1
+
+
+def test_drivers_are_recycled_after_max_pages_and_on_errors():
+    factory = FakeFactory()
+    pool = DriverPool(factory, max_drivers=1, max_pages=2)
+    with pool.driver() as pooled:
+        pooled.get("a")
+        pooled.get("b")
+    assert factory.drivers[0].quit_called
+
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError
+    assert factory.drivers[1].quit_called
+
+    factory.drivers.clear()
+    with pool.driver():
+        pass
+    factory.drivers[0].healthy = False
+    with pool.driver():
+        pass
+    assert factory.drivers[0].quit_called
+    assert len(factory.drivers) == 2
+
+
+def test_acquire_blocks_at_max_drivers():
+    pool = DriverPool(FakeFactory(), max_drivers=1)
+    leased = pool.acquire()
+    acquired = threading.Event()
+
+    def lease():
+        pool.release(pool.acquire())
+        acquired.set()
+
+    thread = threading.Thread(target=lease)
+    thread.start()
+    assert not acquired.wait(0.1)
+    pool.release(leased)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_resize_shuts_down_surplus_drivers():
+    factory = FakeFactory()
+    pool = DriverPool(factory, max_drivers=3)
+    leased = [pool.acquire() for _ in range(3)]
+    pool.release(leased[0])
+    pool.resize(1)
+    assert factory.drivers[0].quit_called
+    pool.release(leased[1])
+    assert factory.drivers[1].quit_called
+    pool.release(leased[2])
+    assert not factory.drivers[2].quit_called
+    with pool.driver() as pooled:
+        assert pooled is leased[2]
+
+    pool.close()
+    assert factory.drivers[2].quit_called
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from pcpartpicker_scraper.engine import ScrapeEngine, TokenBucket
+
+
+class FakeScraper:
+    def __init__(self):
+        self.throttle = None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_pacing(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    bucket = TokenBucket(rate=2.0, capacity=3)
+
+    async def take(tokens):
+        await bucket.acquire(tokens)
+
+    # The burst is free, after that every token costs 1 / rate seconds
+    for _ in range(3):
+        asyncio.run(take(1))
+    assert clock.sleeps == []
+    asyncio.run(take(1))
+    assert clock.sleeps == [0.5]
+    asyncio.run(take(4))
+    assert clock.sleeps == [0.5, 2.0]
+
+    # Tokens refill while idle, but never beyond the capacity
+    clock.now += 100
+    asyncio.run(take(3))
+    assert clock.sleeps == [0.5, 2.0]
+    asyncio.run(take(1))
+    assert clock.sleeps == [0.5, 2.0, 0.5]
+
+
+def test_throttling_paces_each_host():
+    scraper = FakeScraper()
+    engine = ScrapeEngine(scraper, rate=20.0, burst=1)
+    with engine.throttling():
+        started = time.monotonic()
+        for _ in range(3):
+            scraper.throttle("https://pcpartpicker.com/products/cpu/", 1)
+        scraper.throttle("https://uk.pcpartpicker.com/products/cpu/", 1)
+        assert 0.09 <= time.monotonic() - started < 0.5
+    assert scraper.throttle is None
+    assert set(engine.buckets) == {"pcpartpicker.com", "uk.pcpartpicker.com"}
@@ -0,0 +1,11 @@
+from pcpartpicker_scraper.fingerprint import fingerprint, matches_stored
+
+
+def test_matches_stored():
+    pages = {1: [("AMD 2650", "2", "$59.61")], 2: [("AMD 5350", "4", "$104.94")]}
+    stored = {"page_count": 2, "fingerprints": {page: fingerprint(rows) for page, rows in pages.items()}}
+    assert matches_stored(stored, 2, {1: pages[1]})
+    assert matches_stored(stored, 2, pages)
+    assert not matches_stored(stored, 3, {1: pages[1]})
+    assert not matches_stored(stored, 2, {1: [("AMD 2650", "2", "$49.99")]})
+    assert not matches_stored(None, 2, pages)
@@ -0,0 +1,37 @@
+import pytest
+
+from pcpartpicker_scraper.history import ScrapeHistory
+
+
+def test_seconds_per_page(tmp_path):
+    history = ScrapeHistory(str(tmp_path))
+    assert history.seconds_per_page() == ScrapeHistory.default_seconds_per_page
+    history.record(("cpu", "us", None), duration=30.0, pages=10)
+    history.record(("case", "us", None), duration=10.0, pages=10)
+    history.record(("ups", "us", None), pages=4)
+    history.record_full_scrape("cpu", "uk", True)
+    assert history.seconds_per_page() == pytest.approx(2.0)
+
+
+def test_estimate_falls_back_to_page_count(tmp_path):
+    history = ScrapeHistory(str(tmp_path))
+    history.record(("cpu", "us", None), duration=30.0, pages=10)
+    history.record(("ups", "us", None), pages=4)
+    assert history.estimate(("cpu", "us", None)) == 30.0
+    assert history.estimate(("ups", "us", None)) == pytest.approx(12.0)
+    assert history.estimate(("ups", "us", None), seconds_per_page=1.0) == 4.0
+    assert history.estimate(("mouse", "us", None)) is None
+    assert history.unknown([("cpu", "us", None), ("ups", "us", None), ("mouse", "us", None)]) == \
+        [("mouse", "us", None)]
+
+
+def test_longest_first(tmp_path):
+    history = ScrapeHistory(str(tmp_path))
+    history.record(("cpu", "us", None), duration=30.0, pages=10)
+    history.record(("memory", "us", "ECC / Registered"), duration=90.0)
+    history.record(("ups", "us", None), pages=20)
+    jobs = [("mouse", "us", None), ("cpu", "us", None), ("ups", "us", None), ("memory", "us", "ECC / Registered"),
+            ("keyboard", "us", None)]
+    # Jobs without any history go last, in a stable order
+    assert history.longest_first(jobs) == [("memory", "us", "ECC / Registered"), ("ups", "us", None),
+                                           ("cpu", "us", None), ("keyboard", "us", None), ("mouse", "us", None)]
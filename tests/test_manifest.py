@@ -0,0 +1,21 @@
+import os
+
+from pcpartpicker_scraper.manifest import file_digest, raw_digest, write_atomic
+
+
+def test_raw_digest_ignores_order():
+    rows = [("AMD 2650", "2", None, "$59.61"), ("AMD 5350", "4", None, "$104.94")]
+    assert raw_digest((["AMD", "Intel"], rows)) == raw_digest((["Intel", "AMD"], rows[::-1]))
+    assert raw_digest((["AMD"], rows)) != raw_digest((["AMD"], rows[:1]))
+
+
+def test_write_atomic(tmp_path):
+    path = str(tmp_path / "cpu.html")
+    digest = write_atomic(path, "first")
+    assert file_digest(path) == digest
+    modified = os.stat(path).st_mtime_ns
+    assert write_atomic(path, "first") == digest
+    assert os.stat(path).st_mtime_ns == modified
+    assert write_atomic(path, "second") != digest
+    assert open(path).read() == "second"
+    assert os.listdir(str(tmp_path)) == ["cpu.html"]
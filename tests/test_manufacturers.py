@@ -0,0 +1,22 @@
+from pcpartpicker_scraper.manufacturers import ManufacturerCache, resolves
+
+
+def test_resolves():
+    manufacturers = ["AMD", "Cooler Master", "Intel"]
+    assert resolves("AMD Ryzen 5 3600", manufacturers)
+    assert resolves("Cooler Master Hyper 212", manufacturers)
+    assert resolves("Intel", manufacturers)
+    assert resolves(None, manufacturers)
+    assert not resolves("AMDx 1000", manufacturers)
+    assert not resolves("Noctua NH-D15", manufacturers)
+
+
+def test_cache_is_keyed_by_ecc_filter(tmp_path):
+    cache = ManufacturerCache(str(tmp_path))
+    cache.set("us", "memory", ["Kingston"], "ECC / Registered")
+    cache.set("us", "memory", ["Corsair", "Kingston"], "Non-ECC / Unbuffered")
+    cache.set("us", "cpu", ["AMD", "Intel"])
+    assert cache.get("us", "memory", "ECC / Registered") == ["Kingston"]
+    assert cache.get("us", "memory", "Non-ECC / Unbuffered") == ["Corsair", "Kingston"]
+    assert cache.get("us", "memory") is None
+    assert cache.get("us", "cpu") == ["AMD", "Intel"]
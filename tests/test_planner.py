@@ -0,0 +1,45 @@
+from pcpartpicker_scraper.planner import chunk_by_size, has_exclusives, join_prices, split_by_region
+
+
+def test_split_by_region():
+    combos = [("cpu", "us"), ("cpu", "uk"), ("case", "us")]
+    assert split_by_region(combos, "us") == ([("cpu", "us"), ("case", "us")], [("cpu", "uk")])
+
+
+def test_join_prices():
+    spec_rows = [("AMD 2650", "2", "$59.61"), ("AMD 5350", "4", "$104.94"), ("AMD 5350", "4", "$0.00")]
+    joined, unmatched = join_prices("cpu", spec_rows, [("AMD 5350", "£80.00"), ("AMD 9999", "£1.00")])
+    assert joined == [("AMD 5350", "4", "£80.00")]
+    assert unmatched == [("AMD 9999", "£1.00")]
+
+    spec_rows = [("Corsair Vengeance", "DDR4-3200", "ECC / Unbuffered", "$69.99"),
+                 ("Corsair Vengeance", "DDR4-2666", "Non-ECC / Unbuffered", "$49.99")]
+    joined, unmatched = join_prices("memory", spec_rows, [("Corsair Vengeance", "Non-ECC / Unbuffered", "£45.00")])
+    assert joined == [("Corsair Vengeance", "DDR4-2666", "Non-ECC / Unbuffered", "£45.00")]
+    assert unmatched == []
+
+
+def test_join_prices_converts_price_per_gb():
+    spec_rows = [("Corsair Vengeance LPX 16 GB", "DDR4-3200", "2 x 8GB", "$4.000", "Black", "16", "16",
+                  "Non-ECC / Unbuffered", "$64.00")]
+    price_rows = [("Corsair Vengeance LPX 16 GB", "Non-ECC / Unbuffered", "£48.00")]
+    joined, _ = join_prices("memory", spec_rows, price_rows, "£")
+    assert joined[0][3] == "£3.000"
+    assert joined[0][:3] + joined[0][4:] == spec_rows[0][:3] + ("Black", "16", "16", "Non-ECC / Unbuffered",
+                                                                "£48.00")
+
+    joined, _ = join_prices("memory", spec_rows, price_rows)
+    assert joined[0][3] == ""
+    joined, _ = join_prices("memory", spec_rows, [("Corsair Vengeance LPX 16 GB", "Non-ECC / Unbuffered", "")], "£")
+    assert joined[0][3] == ""
+
+
+def test_has_exclusives():
+    spec_rows = [("AMD 2650", "2", "$59.61"), ("AMD 5350", "4", "$104.94")]
+    assert not has_exclusives("cpu", spec_rows, [("AMD 2650", "2", "£50.00")])
+    assert has_exclusives("cpu", spec_rows, [("AMD 2650", "2", "£50.00"), ("AMD 9999", "8", "£1.00")])
+
+
+def test_chunk_by_size():
+    sizes = {"a": 10, "b": 1, "c": 4, "d": 3, "e": 1}
+    assert chunk_by_size(sizes, sizes, 5) == [["a"], ["c", "d"], ["b", "e"]]
@@ -0,0 +1,19 @@
+from pcpartpicker_scraper.prices import refresh_prices
+
+
+def parse_price(price):
+    return [price.lstrip("$"), "USD"] if price else ["0.00", "USD"]
+
+
+def test_refresh_prices():
+    snapshot = [{"brand": "AMD", "model": "2650", "cores": 2, "price": ["59.61", "USD"]},
+                {"brand": "AMD", "model": "5350", "cores": 4, "price": ["104.94", "USD"]},
+                {"brand": "AMD", "model": "5350", "cores": 4, "price": ["0.00", "USD"]},
+                {"brand": "Intel", "model": "G3258", "cores": 2, "price": ["70.00", "USD"]}]
+    rows = [("AMD 2650", "$49.99"), ("AMD 5350", "$99.00"), ("Intel i3-9100", "$120.00")]
+    refreshed, stats = refresh_prices("cpu", snapshot, rows, parse_price)
+    assert refreshed[0] == {"brand": "AMD", "model": "2650", "cores": 2, "price": ["49.99", "USD"]}
+    assert refreshed[1]["price"] == ["104.94", "USD"]
+    assert refreshed[3]["price"] == ["0.00", "USD"]
+    assert snapshot[0]["price"] == ["59.61", "USD"]
+    assert stats == {"updated": 1, "unavailable": 1, "ambiguous": 2, "new": 1}
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from pcpartpicker_scraper.raw_store import RawStore
+
+
+def test_raw_store(tmp_path):
+    store = RawStore(str(tmp_path))
+    store.put("us", "cpu", (["AMD"], [("AMD 2650", "2", "$59.61")]), code="a", now=datetime(2020, 12, 1))
+    store.cache["timestamp"] = datetime(2020, 11, 20)
+    store.cache["uk"] = {"case": (["NZXT"], [("NZXT H510", "ATX", "£69.99")])}
+
+    assert store.needs_migration()
+    store.migrate()
+    assert not store.needs_migration()
+    assert ("us", "cpu") in store
+    assert ("us", "case") not in store
+    assert list(store.items()) == [("uk", "case", (["NZXT"], [("NZXT H510", "ATX", "£69.99")])),
+                                   ("us", "cpu", (["AMD"], [("AMD 2650", "2", "$59.61")]))]
+
+    max_age = timedelta(days=30)
+    assert store.is_fresh("us", "cpu", "a", max_age, datetime(2020, 12, 30))
+    assert not store.is_fresh("us", "cpu", "b", max_age, datetime(2020, 12, 30))
+    assert not store.is_fresh("us", "cpu", "a", max_age, datetime(2020, 12, 31))
+    assert store.is_fresh("uk", "case", "b", max_age, datetime(2020, 12, 1))
+    assert not store.is_fresh("uk", "case", "b", max_age, datetime(2020, 12, 20))
+    assert not store.is_fresh("us", "case", "a", max_age, datetime(2020, 12, 1))
+
+
+def test_raw_store_prices(tmp_path):
+    store = RawStore(str(tmp_path))
+    store.put("us", "cpu", (["AMD"], [("AMD 2650", "2", "$59.61")]), code="a", now=datetime(2020, 12, 1))
+    store.put_prices("us", "cpu", [("AMD 2650", "$49.99")])
+
+    assert store.get_prices("us", "cpu") == [("AMD 2650", "$49.99")]
+    assert store.get("us", "cpu") == (["AMD"], [("AMD 2650", "2", "$59.61")])
+    assert store.combos() == [("us", "cpu")]
+    assert not store.is_fresh("us", "cpu", "a", timedelta(days=30), datetime(2021, 1, 1))
+
+    store.put("us", "cpu", (["AMD"], [("AMD 2650", "2", "$45.00")]), code="a")
+    assert store.get_prices("us", "cpu") is None
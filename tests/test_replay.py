@@ -0,0 +1,23 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pcpartpicker_scraper.replay import FixtureRecorder, ReplayServer, find_fixtures
+
+
+def test_recorded_fixture_is_served(tmp_path):
+    recorder = FixtureRecorder(str(tmp_path))
+    rows = {1: [("AMD 2650", "2", None, "$59.61")], 2: [("AMD 5350", "4", None, "$104.94")]}
+    recorder.save(("us", "cpu", None), "https://pcpartpicker.com/products/cpu/", ["AMD"], rows)
+    recorder.save(("us", "memory", "ECC / Unbuffered"), "https://pcpartpicker.com/products/memory/#E=1",
+                  ["Corsair"], {1: [("Corsair Vengeance", "DDR4-3200", "$69.99")]})
+    assert find_fixtures(str(tmp_path)) == [("cpu", "us"), ("memory", "us")]
+
+    with ReplayServer(str(tmp_path)) as server:
+        html = urllib.request.urlopen(f"{server.root}/us/products/memory/").read().decode("utf-8")
+        fixture = json.loads(html.split("var fixture = ", 1)[1].split(";\n", 1)[0])
+        assert fixture["listings"]["E=1"]["pages"]["1"] == [["Corsair Vengeance", "DDR4-3200", "$69.99"]]
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{server.root}/us/products/case/")
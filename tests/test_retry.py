@@ -0,0 +1,57 @@
+import pytest
+
+from pcpartpicker_scraper.retry import CircuitBreaker, backoff_delays, retry
+
+
+def test_backoff_delays_are_bounded():
+    delays = list(backoff_delays(6, base_delay=1.0, max_delay=4.0))
+    assert len(delays) == 5
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= min(4.0, 2 ** attempt)
+
+
+def test_retry_until_success():
+    calls = []
+    sleeps = []
+
+    def flaky():
+        calls.append(None)
+        if len(calls) < 3:
+            raise ValueError
+        return "done"
+
+    assert retry(flaky, attempts=3, sleep=sleeps.append) == "done"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_retry_raises_last_error():
+    def broken():
+        raise KeyError
+
+    with pytest.raises(KeyError):
+        retry(broken, attempts=2, sleep=lambda _: None)
+
+    with pytest.raises(KeyError):
+        retry(broken, attempts=5, exceptions=(ValueError,), sleep=lambda _: pytest.fail("retried"))
+
+
+def test_circuit_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+    assert not breaker.is_open
@@ -0,0 +1,43 @@
+from pcpartpicker_scraper.archive import PageArchive, is_complete
+from pcpartpicker_scraper.checkpoint import PageCheckpoint
+from pcpartpicker_scraper.scraper import Scraper, generate_part_urls, merge_listings
+
+
+def test_generate_part_urls():
+    assert generate_part_urls("us", "cpu") == {None: "https://pcpartpicker.com/products/cpu/"}
+    assert generate_part_urls("uk", "cpu", root="http://localhost:8000") == \
+        {None: "http://localhost:8000/uk/products/cpu/"}
+    urls = generate_part_urls("de", "memory")
+    assert len(urls) == 4
+    assert urls["ECC / Registered"] == "https://de.pcpartpicker.com/products/memory/#E=11"
+
+
+def test_merge_listings():
+    cpu = (["AMD"], [("AMD 2650", "2", "$59.61")])
+    assert merge_listings("cpu", {None: cpu}) == cpu
+
+    manufacturers, rows = merge_listings("memory", {
+        "ECC / Unbuffered": (["Kingston"], [("Kingston 8GB", "DDR4", "$30.00")]),
+        "Non-ECC / Unbuffered": (["Corsair"], [("Corsair 16GB", "DDR4", "$60.00")]),
+    })
+    assert sorted(manufacturers) == ["Corsair", "Kingston"]
+    assert sorted(rows) == [("Corsair 16GB", "DDR4", "Non-ECC / Unbuffered", "$60.00"),
+                            ("Kingston 8GB", "DDR4", "ECC / Unbuffered", "$30.00")]
+
+
+def test_resumed_listing_is_complete_in_the_archive(tmp_path):
+    key = ("us", "cpu", None)
+    checkpoint = PageCheckpoint(str(tmp_path / "pages"))
+    checkpoint.start(key, ["AMD"], 2)
+    checkpoint.save_page(key, 1, [("AMD 2650", "2", "$59.61")], "first")
+    checkpoint.save_page(key, 2, [("AMD 5350", "4", "$104.94")], "second")
+    archive = PageArchive(str(tmp_path / "archive"), run="resumed")
+
+    # Every page is checkpointed, so no browser is started
+    scraper = Scraper("chromedriver", checkpoint=checkpoint, archive=archive)
+    manufacturers, rows = scraper.get_part_data_for_url(generate_part_urls("us", "cpu")[None], key)
+    assert manufacturers == ["AMD"]
+    assert len(rows) == 2
+    listing = archive.manifest("resumed")[key]
+    assert is_complete(listing)
+    assert listing["digests"] == {1: "first", 2: "second"}
@@ -0,0 +1,32 @@
+from pcpartpicker_scraper.stages import code_digest, normalized_source, publish_digest
+
+
+def test_code_digest():
+    def first(): return 1
+
+    assert code_digest([first, {"b", "a"}]) == code_digest([first, {"a", "b"}])
+    assert code_digest([first, "a"]) != code_digest([first, "b"])
+    assert code_digest([int]) == code_digest([int])
+
+
+def test_publish_digest():
+    assert publish_digest("us", "cpu") == publish_digest("us", "cpu")
+    assert publish_digest("us", "cpu") != publish_digest("uk", "cpu")
+    assert publish_digest("us", "cpu") != publish_digest("us", "memory")
+    assert publish_digest("us", "cpu", ["<html>"]) != publish_digest("us", "cpu", ["<body>"])
+
+
+def test_code_digest_ignores_comments_and_docstrings():
+    def documented(x):
+        """Doubles x."""
+        # Twice as much
+        return x * 2
+
+    def bare(x):
+        return x * 2
+
+    def changed(x):
+        return x * 3
+
+    assert normalized_source(documented).replace("documented", "bare") == normalized_source(bare)
+    assert normalized_source(bare).replace("bare", "changed") != normalized_source(changed)
@@ -0,0 +1,27 @@
+import json
+
+from pcpartpicker_scraper.telemetry import Telemetry
+
+
+def test_telemetry(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    telemetry = Telemetry(str(path))
+    with telemetry.labels("us", "cpu"):
+        telemetry.observe("wait_seconds", 0.2)
+        telemetry.observe("wait_seconds", 3)
+        telemetry.increment("pages_total")
+    telemetry.observe("transfer_bytes", 2048)
+    telemetry.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [event["metric"] for event in events] == ["wait_seconds", "wait_seconds", "pages_total", "transfer_bytes"]
+    assert events[0]["region"] == "us" and events[0]["part"] == "cpu"
+    assert events[3]["region"] == ""
+
+    snapshot = telemetry.prometheus()
+    assert "# TYPE pcpartpicker_wait_seconds histogram" in snapshot
+    assert 'pcpartpicker_wait_seconds_bucket{region="us",part="cpu",le="0.25"} 1' in snapshot
+    assert 'pcpartpicker_wait_seconds_bucket{region="us",part="cpu",le="+Inf"} 2' in snapshot
+    assert 'pcpartpicker_wait_seconds_count{region="us",part="cpu"} 2' in snapshot
+    assert 'pcpartpicker_pages_total{region="us",part="cpu"} 1' in snapshot
+    assert 'pcpartpicker_transfer_bytes_bucket{region="",part="",le="10000"} 1' in snapshot
@@ -0,0 +1,65 @@
+import time
+
+from pcpartpicker_scraper.work_queue import WorkQueue, run_worker
+
+
+def test_lease_priority_and_completion(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    jobs = [("cpu", "us", None), ("memory", "us", "ECC / Registered")]
+    queue.enqueue(jobs, priorities=lambda job: 10 if job[0] == "memory" else 1)
+    queue.enqueue(jobs)
+
+    first = queue.lease("a")
+    second = queue.lease("b")
+    assert first == ("memory", "us", "ECC / Registered")
+    assert second == ("cpu", "us", None)
+    assert queue.lease("c") is None
+
+    queue.complete(first, "a", (["Corsair"], [("Corsair Vengeance", "$10.00")]))
+    queue.complete(second, "a", "ignored, the lease belongs to b")
+    assert dict(queue.results()) == {first: (["Corsair"], [("Corsair Vengeance", "$10.00")])}
+    assert not queue.is_finished()
+
+
+def test_expired_lease_is_handed_out_again(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"), lease_seconds=0.05)
+    queue.enqueue([("cpu", "us", None)])
+    job = queue.lease("a")
+    assert queue.heartbeat(job, "a")
+    time.sleep(0.1)
+    assert queue.lease("b") == job
+    assert not queue.heartbeat(job, "a")
+
+
+def test_failed_jobs_are_retried_until_max_attempts(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    queue.enqueue([("cpu", "us", None), ("case", "uk", None)])
+    attempts = []
+
+    def scrape(part, region, ecc_type):
+        attempts.append(part)
+        if part == "case":
+            raise ValueError("boom")
+        return [], []
+
+    completed = []
+    assert run_worker(queue, scrape, owner="a", poll_interval=0, on_complete=completed.append) == \
+        [("cpu", "us", None)]
+    assert completed == [("cpu", "us", None)]
+    assert sorted(attempts) == ["case", "case", "cpu"]
+    assert queue.is_finished()
+    assert dict(queue.results("failed")) == {("case", "uk", None): "ValueError: boom"}
+
+
+def test_uncollected_results_are_queued_again(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"), max_attempts=1)
+    jobs = [("memory", "us", "ECC / Registered"), ("memory", "us", "ECC / Unbuffered")]
+    queue.enqueue(jobs)
+    first = queue.lease("a")
+    queue.complete(first, "a", ([], []))
+    queue.fail(queue.lease("a"), "a", "ValueError: boom")
+    assert queue.is_finished()
+
+    queue.enqueue(jobs)
+    assert list(queue.results()) == []
+    assert queue.counts() == {"pending": 2}